@@ -1,13 +1,8 @@
-from utils.file_handler import read_sales_data, parse_transactions, validate_and_filter
-from utils.data_processor import (
-    calculate_total_revenue,
-    region_wise_sales,
-    top_selling_products,
-    customer_analysis,
-    daily_sales_trend,
-    find_peak_sales_day,
-    low_performing_products
-)
+import argparse
+import os
+
+from utils.backends import BACKENDS, get_backend
+from utils.file_handler import parse_date_range, validate_and_filter
 from utils.api_handler import fetch_all_products, create_product_mapping, enrich_sales_data, save_enriched_data
 from utils.report_generator import generate_sales_report
 
@@ -19,12 +14,15 @@ def safe_float(text):
         return None
 
 
-def get_user_filters(transactions):
-    regions = sorted(
-        list({t["Region"] for t in transactions if "Region" in t and t["Region"]}))
-    amounts = [t["Quantity"] * t["UnitPrice"] for t in transactions]
-    min_amt = min(amounts) if amounts else 0
-    max_amt = max(amounts) if amounts else 0
+def get_user_filters(transactions, backend=None):
+    if backend is not None:
+        regions, min_amt, max_amt = backend.filter_options(transactions)
+    else:
+        regions = sorted(
+            list({t["Region"] for t in transactions if "Region" in t and t["Region"]}))
+        amounts = [t["Quantity"] * t["UnitPrice"] for t in transactions]
+        min_amt = min(amounts) if amounts else 0
+        max_amt = max(amounts) if amounts else 0
 
     print("\nFilter Options Available:")
     print("Regions:", ", ".join(regions) if regions else "N/A")
@@ -47,47 +45,416 @@ def get_user_filters(transactions):
     return region, min_amount, max_amount
 
 
-def main():
+def positive_int(text):
+    # argparse type for counts that must be at least 1
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}")
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sales Analytics System")
+    parser.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default=None,
+        help="analytics backend (default: $SALES_ANALYTICS_BACKEND or 'python')")
+    parser.add_argument(
+        "--shard-by-region",
+        action="store_true",
+        help="write one report per region plus the global report (no filter prompt)")
+    parser.add_argument(
+        "--quarantine",
+        metavar="PATH",
+        default=None,
+        help="write rejected rows with line number and reason code to PATH")
+    parser.add_argument(
+        "--sqlite",
+        metavar="PATH",
+        default=None,
+        help="also load the enriched transactions into a SQLite database at PATH")
+    parser.add_argument(
+        "--snapshot",
+        metavar="PATH",
+        default="output/analytics_snapshot.json.gz",
+        help="analytics snapshot written by a full run and read by --report-only")
+    parser.add_argument(
+        "--report-only",
+        action="store_true",
+        help="rebuild the report from the snapshot without reading data or calling the API")
+    parser.add_argument(
+        "--from-sqlite",
+        metavar="PATH",
+        default=None,
+        help="build the report from the SQLite store written by --sqlite (honors --since/--until)")
+    parser.add_argument(
+        "--top-n", type=int, default=5,
+        help="products/customers listed in a --report-only / --from-sqlite report (default 5)")
+    parser.add_argument(
+        "--low-threshold", type=int, default=10,
+        help="low performer quantity threshold for --report-only / --from-sqlite (default 10)")
+    parser.add_argument(
+        "--since", metavar="YYYY-MM-DD", default=None,
+        help="only analyze transactions on or after this date")
+    parser.add_argument(
+        "--until", metavar="YYYY-MM-DD", default=None,
+        help="only analyze transactions on or before this date")
+    parser.add_argument(
+        "--last-days", type=positive_int, default=None,
+        help="only analyze the last N days of data (needs --read-partitions)")
+    parser.add_argument(
+        "--write-partitions", metavar="DIR", default=None,
+        help="write validated transactions into date partitions under DIR")
+    parser.add_argument(
+        "--granularity", choices=["day", "month"], default="day",
+        help="partition size for --write-partitions (default day)")
+    parser.add_argument(
+        "--read-partitions", metavar="DIR", default=None,
+        help="read only the date partitions under DIR that the date range needs")
+
+    parser.add_argument(
+        "--catalog", metavar="PATH", action="append", default=[],
+        help="local CSV/JSON product catalog used for enrichment (repeatable, first wins)")
+    parser.add_argument(
+        "--detail-endpoint", metavar="URL", default=None,
+        help="per-product detail URL, e.g. https://dummyjson.com/products/{id}")
+    parser.add_argument(
+        "--enrich-workers", type=int, default=8,
+        help="concurrent detail endpoint lookups (default 8)")
+    parser.add_argument(
+        "--rate", type=float, default=10,
+        help="maximum detail endpoint requests per second (default 10)")
+
+    parser.add_argument(
+        "--cohorts", action="store_true",
+        help="print repeat-purchase figures and the monthly cohort retention matrix")
+
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="keep running and re-analyze data/sales_data.txt whenever it changes")
+    parser.add_argument(
+        "--interval", type=float, default=5,
+        help="seconds between change checks in --watch mode (default 5)")
+
+    args = parser.parse_args(argv)
+    if args.last_days is not None and not args.read_partitions:
+        parser.error("--last-days needs --read-partitions")
+    if args.report_only and args.from_sqlite:
+        parser.error("--report-only and --from-sqlite can't be combined")
+    if args.watch:
+        # watch() runs the plain file -> report pipeline only
+        unsupported = [flag for flag, value in [
+            ("--backend", args.backend), ("--shard-by-region", args.shard_by_region),
+            ("--quarantine", args.quarantine), ("--sqlite", args.sqlite),
+            ("--report-only", args.report_only), ("--from-sqlite", args.from_sqlite),
+            ("--write-partitions", args.write_partitions),
+            ("--read-partitions", args.read_partitions), ("--catalog", args.catalog),
+            ("--detail-endpoint", args.detail_endpoint), ("--cohorts", args.cohorts),
+        ] if value]
+        if unsupported:
+            parser.error(f"--watch can't be combined with {', '.join(unsupported)}")
+    try:
+        parse_date_range(args.since, args.until)
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def enrich_transactions(transactions, product_map, args):
+    """
+    Enriches transactions from the --catalog / --detail-endpoint sources,
+    or from the API product map alone
+
+    Returns: (enriched transactions, source stats or None)
+    """
+    if not (args.catalog or args.detail_endpoint):
+        return enrich_sales_data(transactions, product_map), None
+
+    from utils.catalog_sources import (
+        LocalCatalogSource, DetailEndpointSource, MappingSource, enrich_from_sources
+    )
+
+    sources = [LocalCatalogSource(path) for path in args.catalog]
+    if args.detail_endpoint:
+        sources.append(DetailEndpointSource(args.detail_endpoint, rate=args.rate))
+    sources.append(MappingSource(product_map))
+
+    return enrich_from_sources(transactions, sources, max_workers=args.enrich_workers)
+
+
+def report_only(args):
+    from utils.snapshot import load_snapshot
+    from utils.report_generator import generate_report_from_snapshot
+
+    print("Rebuilding report from snapshot...")
+    snapshot = load_snapshot(args.snapshot)
+    if snapshot is None:
+        return
+
+    generate_report_from_snapshot(
+        snapshot,
+        output_file="output/sales_report.txt",
+        top_n=args.top_n,
+        low_threshold=args.low_threshold
+    )
+    print(f"Snapshot from {snapshot['created']} ({snapshot['records']} records)")
+    print("Report saved to: output/sales_report.txt")
+
+
+def report_from_sqlite(args):
+    """
+    Builds the report from the SQLite store instead of the data file
+
+    The aggregates come from the query_* functions, so no rows are loaded
+    into Python and the product API isn't called.
+    """
+    import sqlite3
+    from utils.sqlite_store import (
+        open_database, query_total_revenue, query_region_wise_sales, query_top_selling_products,
+        query_customer_analysis, query_daily_sales_trend, query_enrichment
+    )
+    from utils.snapshot import build_snapshot
+    from utils.report_generator import generate_report_from_snapshot
+
+    # open_database() would create an empty store
+    if not os.path.exists(args.from_sqlite):
+        print(f"Error: Database not found - {args.from_sqlite}")
+        return
+
+    dates = {'start_date': args.since, 'end_date': args.until}
+    print(f"Querying {args.from_sqlite} ({args.since or 'start'} to {args.until or 'end'})...")
+    conn = open_database(args.from_sqlite)
+    try:
+        enriched_count, enriched_total, failed_products = query_enrichment(conn, **dates)
+        snapshot = build_snapshot(
+            query_total_revenue(conn, **dates),
+            query_region_wise_sales(conn, **dates),
+            query_top_selling_products(conn, n=None, **dates),
+            query_customer_analysis(conn, **dates),
+            query_daily_sales_trend(conn, **dates),
+            enriched_count, enriched_total, failed_products
+        )
+    except sqlite3.Error as e:
+        print(f"Error: Unable to query {args.from_sqlite}: {e}")
+        return
+    finally:
+        conn.close()
+
+    generate_report_from_snapshot(
+        snapshot,
+        output_file="output/sales_report.txt",
+        top_n=args.top_n,
+        low_threshold=args.low_threshold
+    )
+    print(f"{snapshot['records']} records")
+    print("Report saved to: output/sales_report.txt")
+
+
+def watch(args, filename="data/sales_data.txt"):
+    """
+    Re-runs the non-interactive pipeline whenever the input file changes
+
+    - nothing changed: nothing is read, analyzed or written
+    - rows appended: only the new tail is parsed, validated and enriched
+    - anything else: the whole file is processed again
+    """
+    from datetime import datetime
+    from utils.file_handler import decode_lines, parse_transactions, validate_and_filter
+    from utils.data_processor import (
+        calculate_total_revenue, region_wise_sales, top_selling_products,
+        customer_analysis, daily_sales_trend
+    )
+    from utils.watcher import FileWatcher, ChangeWaiter, APPENDED, REPLACED, MISSING
+    from utils.snapshot import build_snapshot, save_snapshot
+    from utils.report_generator import iter_failed_products
+
+    watcher = FileWatcher(filename)
+    waiter = ChangeWaiter(filename, args.interval)
+
+    print("Fetching product data from API...")
+    product_map = create_product_mapping(fetch_all_products())
+
+    print(f"Watching {filename} ({waiter.mode}, every {args.interval}s). Press Ctrl+C to stop.\n")
+    valid_transactions = []
+    enriched_transactions = []
+    missing_reported = False
+
     try:
+        while True:
+            status, data = watcher.check()
+            stamp = datetime.now().strftime('%H:%M:%S')
+
+            if status == MISSING:
+                if not missing_reported:
+                    print(f"[{stamp}] Error: File not found - {filename}")
+                missing_reported = True
+            elif status in (APPENDED, REPLACED):
+                missing_reported = False
+                if status == REPLACED:
+                    valid_transactions = []
+                    enriched_transactions = []
+
+                new_valid, invalid_count, _ = validate_and_filter(
+                    parse_transactions(decode_lines(data)),
+                    start_date=args.since, end_date=args.until)
+                valid_transactions.extend(new_valid)
+                enriched_transactions.extend(enrich_sales_data(new_valid, product_map))
+
+                save_enriched_data(enriched_transactions, filename="data/enriched_sales_data.txt")
+                generate_sales_report(valid_transactions, enriched_transactions,
+                                      output_file="output/sales_report.txt")
+                save_snapshot(
+                    build_snapshot(
+                        calculate_total_revenue(valid_transactions),
+                        region_wise_sales(valid_transactions),
+                        top_selling_products(valid_transactions, n=None),
+                        customer_analysis(valid_transactions),
+                        daily_sales_trend(valid_transactions),
+                        sum(1 for t in enriched_transactions if t.get("API_Match") is True),
+                        len(enriched_transactions),
+                        iter_failed_products(enriched_transactions)
+                    ),
+                    args.snapshot
+                )
+                print(f"[{stamp}] {status}: {len(new_valid)} new valid, {invalid_count} invalid, "
+                      f"{len(valid_transactions)} total -> output/sales_report.txt")
+
+            waiter.wait()
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        waiter.close()
+
+
+def main(argv=None):
+    reject_sink = None
+    try:
+        args = parse_args(argv)
+        if args.report_only:
+            report_only(args)
+            return
+        if args.from_sqlite:
+            report_from_sqlite(args)
+            return
+        if args.watch:
+            watch(args)
+            return
+
+        backend = get_backend(args.backend)
+
         print("==============================================")
         print("SALES ANALYTICS SYSTEM")
         print("==============================================\n")
 
+        if args.quarantine:
+            from utils.quarantine import QuarantineSink
+            reject_sink = QuarantineSink(args.quarantine)
+
+        start_date, end_date = args.since, args.until
+        # Date ranges of the rows read, when only part of the data was
+        # read (the SQLite store then only replaces those dates)
+        loaded_dates = None
+
         print("[1/10] Reading sales data...")
-        raw_lines = read_sales_data("data/sales_data.txt")
-        if not raw_lines:
+        if args.read_partitions:
+            from utils.partitions import load_manifest, select_partitions, last_days_range
+
+            manifest = load_manifest(args.read_partitions)
+            if args.last_days is not None:
+                start_date, end_date = last_days_range(manifest, args.last_days)
+            files = select_partitions(manifest, start_date, end_date)
+            if len(files) < len(manifest['partitions']):
+                loaded_dates = [(info['min_date'], info['max_date'])
+                                for info in manifest['partitions'].values() if info['file'] in files]
+            print(f"Reading {len(files)} of {len(manifest['partitions'])} partitions "
+                  f"({start_date or 'start'} to {end_date or 'end'})")
+            transactions = backend.load_many(
+                [os.path.join(args.read_partitions, f) for f in files],
+                reject_sink=reject_sink)
+        else:
+            transactions = backend.load("data/sales_data.txt", reject_sink=reject_sink)
+        if len(transactions) == 0:
             print("No sales data loaded. Exiting.")
             return
-        print(f"Successfully read {len(raw_lines)} transactions\n")
+        print(f"Successfully read {backend.lines_read} transactions\n")
 
-        print("[2/10] Parsing and cleaning data...")
-        transactions = parse_transactions(raw_lines)
+        print(f"[2/10] Parsing and cleaning data ({backend.name} backend)...")
         print(f"Parsed {len(transactions)} records\n")
 
         print("[3/10] Displaying filter options...")
-        region, min_amount, max_amount = get_user_filters(transactions)
+        if args.shard_by_region:
+            print("Sharded report mode: filters skipped")
+            region, min_amount, max_amount = None, None, None
+        else:
+            region, min_amount, max_amount = get_user_filters(
+                transactions, backend)
 
         print("\n[4/10] Validating transactions...")
-        valid_transactions, invalid_count, summary = validate_and_filter(
+        valid_data, invalid_count, summary = backend.validate_and_filter(
             transactions,
             region=region,
             min_amount=min_amount,
-            max_amount=max_amount
+            max_amount=max_amount,
+            reject_sink=reject_sink,
+            start_date=start_date,
+            end_date=end_date
         )
         print(
-            f"Valid: {len(valid_transactions)} | Invalid removed: {invalid_count}")
-        print("Summary:", summary, "\n")
+            f"Valid: {len(valid_data)} | Invalid removed: {invalid_count}")
+        print("Summary:", summary)
+        if reject_sink is not None:
+            reject_sink.close()
+            print(f"Quarantined: {reject_sink.summary()} -> {args.quarantine}")
+        print()
 
         print("[5/10] Analyzing sales data...")
-        total_revenue = calculate_total_revenue(valid_transactions)
-        reg_stats = region_wise_sales(valid_transactions)
-        top_products = top_selling_products(valid_transactions, n=5)
-        top_customers = customer_analysis(valid_transactions)
-        trend = daily_sales_trend(valid_transactions)
-        peak_day = find_peak_sales_day(valid_transactions)
-        low_perf = low_performing_products(valid_transactions, threshold=10)
+        total_revenue = backend.calculate_total_revenue(valid_data)
+        reg_stats = backend.region_wise_sales(valid_data)
+        all_products = backend.top_selling_products(valid_data, n=None)
+        top_products = all_products[:5]
+        top_customers = backend.customer_analysis(valid_data)
+        trend = backend.daily_sales_trend(valid_data)
+        peak_day = backend.find_peak_sales_day(valid_data)
+        low_perf = backend.low_performing_products(valid_data, threshold=10)
+        valid_transactions = backend.to_records(valid_data)
         print("Analysis complete\n")
 
+        # Stores (partitions, SQLite) keep every valid row, not just the
+        # ones the user filtered down to
+        user_filtered = any(value is not None for value in (
+            region, min_amount, max_amount, start_date, end_date))
+        if user_filtered and (args.sqlite or args.write_partitions):
+            all_valid = backend.to_records(backend.validate_and_filter(transactions)[0])
+        else:
+            all_valid = valid_transactions
+        # SQLite stores every valid row enriched: enrich those once and
+        # pick the filtered ones out, rather than enriching twice
+        enrich_all = args.sqlite and all_valid is not valid_transactions
+
+        if args.cohorts:
+            from utils.cohort_analysis import (
+                analyze_cohorts, repeat_purchase_summary, format_retention_matrix)
+
+            customers, cohorts = analyze_cohorts(valid_transactions)
+            repeat = repeat_purchase_summary(customers)
+            print(f"Repeat customers: {repeat['repeat_customers']} of {repeat['customers']} "
+                  f"({repeat['repeat_rate']}%), avg days between purchases: "
+                  f"{repeat['avg_days_between']}")
+            print("\n".join(format_retention_matrix(cohorts)))
+            print()
+
+        if args.write_partitions:
+            from utils.partitions import write_partitions
+
+            manifest = write_partitions(
+                all_valid, args.write_partitions, args.granularity)
+            print(f"Partitions written to: {args.write_partitions} "
+                  f"({len(manifest['partitions'])} partitions)\n")
+
         print("[6/10] Fetching product data from API...")
         api_products = fetch_all_products()
         print(f"Fetched {len(api_products)} products\n")
@@ -95,8 +462,18 @@ def main():
         product_map = create_product_mapping(api_products)
 
         print("[7/10] Enriching sales data...")
-        enriched_transactions = enrich_sales_data(
-            valid_transactions, product_map)
+        if enrich_all:
+            stored, source_stats = enrich_transactions(all_valid, product_map, args)
+            enriched_transactions = validate_and_filter(
+                stored, region=region, min_amount=min_amount, max_amount=max_amount,
+                start_date=start_date, end_date=end_date)[0]
+        else:
+            enriched_transactions, source_stats = enrich_transactions(
+                valid_transactions, product_map, args)
+            stored = enriched_transactions
+        if source_stats is not None:
+            print(f"Resolved {source_stats['distinct_ids']} product IDs "
+                  f"({source_stats['remote_ids']} remote): {source_stats['matched_by']}")
         enriched_count = sum(
             1 for t in enriched_transactions if t.get("API_Match") is True)
         success_rate = (enriched_count / len(enriched_transactions)
@@ -107,15 +484,51 @@ def main():
         print("[8/10] Saving enriched data...")
         save_enriched_data(enriched_transactions,
                            filename="data/enriched_sales_data.txt")
-        print("Saved to: data/enriched_sales_data.txt\n")
+        print("Saved to: data/enriched_sales_data.txt")
+        if args.sqlite:
+            from utils.sqlite_store import open_database, load_transactions
+
+            conn = open_database(args.sqlite)
+            if loaded_dates is None:
+                loaded = load_transactions(conn, stored, replace=True)
+            else:
+                loaded = load_transactions(conn, stored, replace_dates=loaded_dates)
+            conn.close()
+            print(f"Loaded {loaded} transactions into: {args.sqlite}")
+        print()
 
         print("[9/10] Generating report...")
-        generate_sales_report(
-            valid_transactions,
-            enriched_transactions,
-            output_file="output/sales_report.txt"
+        from utils.snapshot import build_snapshot, save_snapshot
+        from utils.report_generator import iter_failed_products
+
+        save_snapshot(
+            build_snapshot(
+                total_revenue, reg_stats, all_products, top_customers, trend,
+                enriched_count, len(enriched_transactions),
+                iter_failed_products(enriched_transactions)
+            ),
+            args.snapshot
         )
-        print("Report saved to: output/sales_report.txt\n")
+        print(f"Snapshot saved to: {args.snapshot}")
+        if args.shard_by_region:
+            # Loaded lazily: only needed in sharded mode
+            from utils.sharding import generate_sharded_reports
+
+            reports = generate_sharded_reports(
+                valid_transactions,
+                enriched_transactions,
+                output_dir="output"
+            )
+            for name, path in reports.items():
+                print(f"Report saved to: {path} ({name})")
+            print()
+        else:
+            generate_sales_report(
+                valid_transactions,
+                enriched_transactions,
+                output_file="output/sales_report.txt"
+            )
+            print("Report saved to: output/sales_report.txt\n")
 
         print("[10/10] Process Complete!")
         print("==============================================")
@@ -124,6 +537,11 @@ def main():
         print("\nSomething went wrong but the program didn't crash.")
         print("Error:", e)
 
+    finally:
+        # Early returns must still flush the quarantine file
+        if reject_sink is not None:
+            reject_sink.close()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,33 @@
+import os
+import random
+import sys
+
+# Tests import the application modules (utils.*, main) from the repo root
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SAMPLE_FILE = os.path.join(ROOT, "data", "sales_data.txt")
+
+HEADER = "TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region\n"
+
+
+def write_synthetic(path, rows, seed):
+    # Messy rows: bad ids, bad numbers, thousands separators, short/long rows
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(HEADER)
+        for i in range(rows):
+            quantity = rng.choice(['1', '2', '0', '-1', 'x', '3', '1,200', '2.0', ''])
+            price = rng.choice(['173', '1,916', '45000', '0', 'abc', '12.5', '99.99'])
+            line = (f"{rng.choice('TXT')}{i}|2024-12-{rng.randint(1, 30):02d}|"
+                    f"{rng.choice('PPQ')}{rng.randint(100, 130)}|"
+                    f"{rng.choice(['Mouse', 'USB Cable', 'Laptop, Pro', 'Webcam '])}|"
+                    f"{quantity}|{price}|{rng.choice('CCD')}{rng.randint(1, 300):03d}|"
+                    f"{rng.choice(['North', 'South', 'East', 'West', '', ' north'])}")
+            if rng.random() < 0.03:
+                line += "|extra"
+            if rng.random() < 0.03:
+                line = line.rsplit('|', 1)[0]
+            if rng.random() < 0.02:
+                file.write("\n")
+            file.write(line + "\n")
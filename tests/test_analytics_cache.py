@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from utils.analytics_cache import Dataset, analytics_cache_stats, clear_analytics_cache
+from utils.data_processor import customer_analysis, calculate_total_revenue, top_selling_products
+from utils.file_handler import read_sales_data, parse_transactions, validate_and_filter
+from tests.conftest import SAMPLE_FILE
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_analytics_cache()
+    yield
+    clear_analytics_cache()
+
+
+def rows():
+    return [{'TransactionID': 'T1', 'Date': '2024-12-01', 'ProductID': 'P1', 'ProductName': 'Mouse',
+             'Quantity': 1, 'UnitPrice': 10.0, 'CustomerID': 'C1', 'Region': 'North'}]
+
+
+def load():
+    return validate_and_filter(parse_transactions(read_sales_data(SAMPLE_FILE)))[0]
+
+
+def test_plain_lists_are_not_cached():
+    transactions = rows()
+    assert calculate_total_revenue(transactions) == 10.0
+    transactions[0]['Quantity'] = 5
+    assert calculate_total_revenue(transactions) == 50.0
+    assert analytics_cache_stats()['size'] == 0
+
+
+def test_datasets_are_cached_per_fingerprint():
+    first = customer_analysis(load())
+    assert customer_analysis(load()) == first
+    assert analytics_cache_stats()['hits'] == 1
+
+
+def test_changed_dataset_misses():
+    transactions = Dataset(rows(), ('test',))
+    assert calculate_total_revenue(transactions) == 10.0
+
+    transactions.append(rows()[0])
+    assert calculate_total_revenue(transactions) == 20.0
+
+    transactions[0] = dict(rows()[0], Quantity=3)
+    assert transactions.fingerprint is None
+    assert calculate_total_revenue(transactions) == 40.0
+
+
+def test_callers_get_copies():
+    transactions = load()
+    result = customer_analysis(transactions)
+    customer = next(iter(result))
+    expected = result[customer]['total_spent']
+
+    result[customer]['total_spent'] = 0
+    result[customer]['products_bought'].append('Tampered')
+    top_selling_products(transactions).clear()
+
+    again = customer_analysis(transactions)
+    assert again[customer]['total_spent'] == expected
+    assert 'Tampered' not in again[customer]['products_bought']
+    assert top_selling_products(transactions)
+
+
+def test_concurrent_callers():
+    transactions = load()
+    expected = customer_analysis(list(transactions))
+    results = []
+
+    def call():
+        for _ in range(20):
+            result = customer_analysis(transactions)
+            results.append(result == expected)
+            next(iter(result.values()))['purchase_count'] = -1
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 160 and all(results)
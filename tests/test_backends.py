@@ -0,0 +1,106 @@
+# Parity tests: PandasBackend must return exactly what PythonBackend returns
+
+import pytest
+
+from tests.conftest import HEADER, SAMPLE_FILE, write_synthetic
+from utils.backends import PythonBackend, PandasBackend
+
+pytest.importorskip("pandas")
+
+
+ANALYSES = [
+    ('calculate_total_revenue', {}),
+    ('region_wise_sales', {}),
+    ('top_selling_products', {}),
+    ('top_selling_products', {'n': None}),
+    ('customer_analysis', {}),
+    ('daily_sales_trend', {}),
+    ('find_peak_sales_day', {}),
+    ('low_performing_products', {}),
+    ('low_performing_products', {'threshold': 50}),
+]
+
+FILTERS = [
+    {},
+    {'region': 'north'},
+    {'min_amount': 1000, 'max_amount': 50000},
+    {'start_date': '2024-12-05', 'end_date': '2024-12-20'},
+]
+
+
+def assert_parity(filename):
+    python, pandas = PythonBackend(), PandasBackend()
+    records = python.load(filename)
+    df = pandas.load(filename)
+
+    assert pandas.lines_read == python.lines_read
+    assert pandas.to_records(df) == records
+    assert pandas.filter_options(df) == python.filter_options(records)
+
+    for filters in FILTERS:
+        expected = python.validate_and_filter(records, **filters)
+        actual = pandas.validate_and_filter(df, **filters)
+        assert actual[1:] == expected[1:]
+        assert pandas.to_records(actual[0]) == expected[0]
+
+        for method, kwargs in ANALYSES:
+            want = getattr(python, method)(expected[0], **kwargs)
+            got = getattr(pandas, method)(actual[0], **kwargs)
+            assert got == want, (method, kwargs, filters)
+            if isinstance(want, dict):
+                # same ordering too
+                assert list(got) == list(want)
+
+
+def test_sample_file():
+    assert_parity(SAMPLE_FILE)
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_synthetic_data(tmp_path, seed):
+    filename = tmp_path / "sales.txt"
+    write_synthetic(filename, 3000, seed)
+    assert_parity(str(filename))
+
+
+def test_empty_file(tmp_path):
+    filename = tmp_path / "empty.txt"
+    filename.write_text("")
+    assert_parity(str(filename))
+
+
+def test_header_only_file(tmp_path):
+    filename = tmp_path / "header.txt"
+    filename.write_text(HEADER)
+    assert_parity(str(filename))
+
+
+def test_missing_file(tmp_path):
+    filename = str(tmp_path / "missing.txt")
+    assert PythonBackend().load(filename) == []
+    assert len(PandasBackend().load(filename)) == 0
+
+
+def test_load_many_counts_raw_lines(tmp_path):
+    first, second = tmp_path / "a.txt", tmp_path / "b.txt"
+    write_synthetic(first, 200, 7)
+    write_synthetic(second, 300, 8)
+    files = [str(first), str(second)]
+
+    python, pandas = PythonBackend(), PandasBackend()
+    records = python.load_many(files)
+    assert pandas.to_records(pandas.load_many(files)) == records
+    assert pandas.lines_read == python.lines_read
+    assert python.lines_read >= len(records)
+
+
+@pytest.mark.parametrize("bounds", [
+    {'start_date': '2024-13-45'},
+    {'end_date': 'yesterday'},
+    {'start_date': '2024-12-01', 'end_date': ''},
+])
+def test_invalid_date_bound_is_an_error(bounds):
+    for backend in (PythonBackend(), PandasBackend()):
+        data = backend.load(SAMPLE_FILE)
+        with pytest.raises(ValueError):
+            backend.validate_and_filter(data, **bounds)
@@ -0,0 +1,120 @@
+# DetailEndpointSource against a local stand-in for the product detail API
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from utils.catalog_sources import DetailEndpointSource, LocalCatalogSource, MappingSource, enrich_from_sources
+
+pytest.importorskip("requests")
+
+PRODUCTS = {
+    '1': {'id': 1, 'category': 'laptops', 'brand': 'Apple', 'rating': 4.5},
+    '2': {'id': 2, 'category': 'mice', 'brand': 'Logi', 'rating': '4.1'},
+    '3': {'id': 3, 'category': 'cables', 'brand': None, 'rating': [5]},
+    '7': [1, 2],
+}
+
+
+class StandIn(BaseHTTPRequestHandler):
+    def do_GET(self):
+        product_id = self.path.rsplit('/', 1)[-1]
+        with self.server.lock:
+            self.server.requests.append((product_id, time.monotonic()))
+        time.sleep(self.server.delay)
+
+        if product_id not in PRODUCTS:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = json.dumps(PRODUCTS[product_id]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StandIn)
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.delay = 0.0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}/products/{{id}}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_concurrent_lookups_are_coalesced(server):
+    server.delay = 0.2
+    source = DetailEndpointSource(server.url, rate=0)
+    results = []
+
+    def lookup():
+        results.append(source.lookup('P1'))
+
+    threads = [threading.Thread(target=lookup) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [('laptops', 'Apple', 4.5, True)] * 8
+    assert source.requests_made == 1
+    assert [product_id for product_id, _ in server.requests] == ['1']
+
+    # cached afterwards, misses included
+    assert source.lookup('P99') is None
+    assert source.lookup('P99') is None
+    assert source.requests_made == 2
+
+
+def test_requests_are_rate_limited(server):
+    rate = 20
+    source = DetailEndpointSource(server.url, rate=rate)
+    transactions = [{'ProductID': f'P{i}'} for i in range(1, 7)]
+
+    enrich_from_sources(transactions, [source], max_workers=6)
+
+    times = sorted(at for _, at in server.requests)
+    assert len(times) == 6
+    # 6 requests at 20/s span at least 5 intervals (small timer slack)
+    assert times[-1] - times[0] >= 5 / rate - 0.02
+
+
+def test_sources_are_tried_in_priority_order(server, tmp_path):
+    catalog = tmp_path / "catalog.csv"
+    catalog.write_text("ProductID,category,brand,rating\nP1,local,Local,1.0\n", encoding='utf-8')
+    mapping = {5: {'title': 'Webcam', 'category': 'webcams', 'brand': 'Cam', 'rating': 3.0}}
+
+    local = LocalCatalogSource(str(catalog))
+    remote = DetailEndpointSource(server.url, rate=0)
+    fallback = MappingSource(mapping)
+    transactions = [{'ProductID': p} for p in ['P1', 'P2', 'P5', 'P1', 'P8']]
+
+    enriched, stats = enrich_from_sources(transactions, [local, remote, fallback])
+
+    assert [t['API_Category'] for t in enriched] == ['local', 'mice', 'webcams', 'local', None]
+    assert enriched[1]['API_Rating'] == 4.1
+    assert enriched[-1]['API_Match'] is False
+    assert stats == {'distinct_ids': 4, 'remote_ids': 3,
+                     'matched_by': {str(catalog): 1, server.url: 1, 'api_mapping': 1}}
+    # a local hit never reaches the endpoint
+    assert sorted(product_id for product_id, _ in server.requests) == ['2', '5', '8']
+
+
+def test_non_object_json_is_a_miss(server):
+    source = DetailEndpointSource(server.url, rate=0)
+    assert source.lookup('P7') is None
+    # odd field types don't break an entry either
+    assert source.lookup('P3') == ('cables', None, None, True)
@@ -0,0 +1,82 @@
+# The single-pass cohort metrics must equal a straightforward recomputation
+
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from utils.cohort_analysis import analyze_cohorts, repeat_purchase_summary
+
+
+def make_transactions(seed=3, customers=300):
+    rng = random.Random(seed)
+    start = date(2023, 1, 1)
+    transactions = []
+    for c in range(customers):
+        # some customers buy once, others across many months
+        first = start + timedelta(days=rng.randrange(700))
+        for _ in range(rng.choice([1, 1, 2, 5, 20])):
+            d = first + timedelta(days=rng.randrange(0, rng.choice([1, 30, 400])))
+            transactions.append({
+                'TransactionID': f'T{len(transactions)}', 'Date': d.isoformat(),
+                'ProductID': 'P1', 'ProductName': 'Mouse', 'Quantity': rng.randint(1, 9),
+                'UnitPrice': rng.randint(1, 500_000) / 100, 'CustomerID': f'C{c:04d}',
+                'Region': 'North'})
+    transactions.append(dict(transactions[0], Date='not a date'))
+    rng.shuffle(transactions)
+    return transactions
+
+
+def naive_cohorts(transactions):
+    by_customer = {}
+    for t in transactions:
+        try:
+            d = date.fromisoformat(t['Date'])
+        except ValueError:
+            continue
+        by_customer.setdefault(t['CustomerID'], []).append((d, t))
+
+    customers = {}
+    cohorts = {}
+    for customer, rows in by_customer.items():
+        days = sorted({d for d, _ in rows})
+        gaps = [(b - a).days for a, b in zip(days, days[1:])]
+        spent = sum(t['Quantity'] * Decimal(str(t['UnitPrice'])) for _, t in rows)
+        cohort = days[0].strftime('%Y-%m')
+        customers[customer] = {
+            'cohort': cohort,
+            'first_purchase': days[0].isoformat(),
+            'last_purchase': days[-1].isoformat(),
+            'purchase_count': len(rows),
+            'purchase_days': len(days),
+            'total_spent': float(spent),
+            'avg_days_between': round(sum(gaps) / len(gaps), 2) if gaps else None,
+            'max_days_between': max(gaps) if gaps else None,
+            'repeat': len(days) > 1
+        }
+
+        months = {(d.year - days[0].year) * 12 + d.month - days[0].month for d in days}
+        counts = cohorts.setdefault(cohort, [])
+        counts.extend([0] * (max(months) + 1 - len(counts)))
+        for offset in months:
+            counts[offset] += 1
+
+    return customers, dict(sorted(cohorts.items()))
+
+
+def test_single_pass_matches_naive_recomputation():
+    transactions = make_transactions()
+    customers, cohorts = analyze_cohorts(transactions)
+    expected_customers, expected_cohorts = naive_cohorts(transactions)
+
+    assert customers == expected_customers
+    assert cohorts == expected_cohorts
+    # the data really spreads customers over many cohort months
+    assert len(cohorts) > 12 and max(len(counts) for counts in cohorts.values()) > 6
+
+    summary = repeat_purchase_summary(customers)
+    repeat = [c for c in expected_customers.values() if c['repeat']]
+    assert summary['repeat_customers'] == len(repeat)
+    gaps = sum(c['purchase_days'] - 1 for c in repeat)
+    total_gap = sum((date.fromisoformat(c['last_purchase']) - date.fromisoformat(c['first_purchase'])).days
+                    for c in repeat)
+    assert summary['avg_days_between'] == round(total_gap / gaps, 2)
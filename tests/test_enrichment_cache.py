@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+from utils import api_handler
+from utils.api_handler import create_product_mapping, enrich_sales_data, enrichment_cache_stats
+from utils.cache import LRUCache
+
+PRODUCTS = [
+    {'id': 101, 'title': 'Laptop', 'category': 'laptops', 'brand': 'Apple', 'rating': 4.7},
+    {'id': 102, 'title': 'Mouse', 'category': 'accessories', 'brand': 'Logi', 'rating': 4.1},
+]
+
+
+def rows(*product_ids):
+    return [{'TransactionID': f'T{i}', 'Date': '2024-12-01', 'ProductID': p, 'ProductName': 'x',
+             'Quantity': 1, 'UnitPrice': 1.0, 'CustomerID': 'C1', 'Region': 'North'}
+            for i, p in enumerate(product_ids)]
+
+
+@pytest.fixture(autouse=True)
+def fresh_lookup_cache(monkeypatch):
+    monkeypatch.setattr(api_handler, '_lookup_cache', LRUCache(maxsize=4096))
+    monkeypatch.setattr(api_handler, '_lookup_version', None)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1          # 'b' is now the oldest
+    cache.put('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats() == {'hits': 3, 'misses': 1, 'evictions': 1, 'size': 2, 'maxsize': 2}
+
+    cache.put('a', 10)                  # update keeps the size
+    assert len(cache) == 2 and cache.get('a') == 10
+
+
+def test_lru_is_thread_safe():
+    cache = LRUCache(maxsize=50)
+
+    def work(offset):
+        for i in range(2000):
+            key = (offset + i) % 80
+            if cache.get(key) is None:
+                cache.put(key, key)
+
+    threads = [threading.Thread(target=work, args=(n * 7,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert stats['hits'] + stats['misses'] == 8 * 2000
+    assert stats['size'] <= 50
+
+
+def test_second_run_hits_the_cache():
+    mapping = create_product_mapping(PRODUCTS)
+    transactions = rows('P101', 'P102', 'P101', 'P999')
+
+    first = enrich_sales_data(transactions, mapping)
+    assert enrichment_cache_stats()['misses'] == 3 and enrichment_cache_stats()['hits'] == 0
+    assert [t['API_Match'] for t in first] == [True, True, True, False]
+
+    # distinct ids are resolved once per run; the next run only hits
+    assert enrich_sales_data(transactions, mapping) == first
+    assert enrichment_cache_stats()['hits'] == 3 and enrichment_cache_stats()['misses'] == 3
+
+
+def test_changed_catalog_invalidates_lookups():
+    mapping = create_product_mapping(PRODUCTS)
+    assert enrich_sales_data(rows('P101'), mapping)[0]['API_Brand'] == 'Apple'
+
+    changed = create_product_mapping([dict(PRODUCTS[0], brand='Dell')])
+    assert enrich_sales_data(rows('P101', 'P102'), changed)[0]['API_Brand'] == 'Dell'
+    assert enrich_sales_data(rows('P102'), changed)[0]['API_Match'] is False
+    assert enrichment_cache_stats()['size'] == 2
+
+    # an equal mapping (new object) keeps the cached lookups
+    hits = enrichment_cache_stats()['hits']
+    enrich_sales_data(rows('P101'), create_product_mapping([dict(PRODUCTS[0], brand='Dell')]))
+    assert enrichment_cache_stats()['hits'] == hits + 1
@@ -0,0 +1,48 @@
+import os
+import stat
+
+import pytest
+
+from utils.file_handler import atomic_write
+
+
+def umask():
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+def test_new_file_gets_default_permissions(tmp_path):
+    before = umask()
+    path = tmp_path / "report.txt"
+    with atomic_write(str(path)) as file:
+        file.write("report")
+
+    assert path.read_text() == "report"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~before
+    assert umask() == before
+
+
+def test_existing_file_keeps_its_permissions(tmp_path):
+    path = tmp_path / "report.txt"
+    path.write_text("old")
+    os.chmod(path, 0o640)
+
+    with atomic_write(str(path), 'wb') as file:
+        file.write(b"new")
+
+    assert path.read_bytes() == b"new"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+
+def test_failed_write_leaves_the_old_file(tmp_path):
+    path = tmp_path / "report.txt"
+    path.write_text("old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path)) as file:
+            file.write("half")
+            raise RuntimeError("interrupted")
+
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["report.txt"]
@@ -0,0 +1,90 @@
+# Revenue must be exact to the cent on every path
+
+from decimal import Decimal
+
+import pytest
+
+from tests.conftest import HEADER
+from utils.backends import PythonBackend
+from utils.money import is_whole_minor_units, to_minor_units
+from utils.quarantine import QuarantineSink
+from utils.report_generator import generate_sales_report
+
+ROWS = [
+    # TransactionID, Quantity, UnitPrice
+    ('T001', 1000, '0.125'),     # sub-cent: rejected, not rounded
+    ('T002', 3, '0.10'),
+    ('T003', 7, '19.99'),
+    ('T004', 1, '99.99'),
+    ('T005', 250, '0.01'),
+    ('T006', 2, '1,234,567.89'),
+    ('T007', 9, '0.3'),
+    ('T008', 1, '10.005'),       # sub-cent
+]
+
+
+def write_rows(path):
+    lines = [HEADER.rstrip("\n")]
+    for i, (tid, qty, price) in enumerate(ROWS):
+        lines.append(f"{tid}|2024-12-{i + 1:02d}|P10{i}|Item {i}|{qty}|{price}|C00{i}|North")
+    path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+
+def expected_total():
+    return sum(qty * Decimal(price.replace(',', '')) for _, qty, price in ROWS
+               if Decimal(price.replace(',', '')) * 100 % 1 == 0)
+
+
+def test_is_whole_minor_units():
+    for price in [1916.0, 99.99, 0.01, 0.3, 1234567.89, 45000]:
+        assert is_whole_minor_units(price)
+        assert to_minor_units(price) == int(Decimal(str(price)) * 100)
+    for price in [0.125, 10.005, 0.001, 99.999]:
+        assert not is_whole_minor_units(price)
+
+
+def test_python_path_is_exact_and_rejects_sub_cent(tmp_path):
+    data = tmp_path / "sales.txt"
+    write_rows(data)
+    backend = PythonBackend()
+
+    quarantine = tmp_path / "quarantine.txt"
+    with QuarantineSink(str(quarantine)) as sink:
+        valid, invalid_count, _ = backend.validate_and_filter(
+            backend.load(str(data), reject_sink=sink), reject_sink=sink)
+
+    assert invalid_count == 2
+    assert sink.counts == {'sub_cent_price': 2}
+    assert [line.split('|')[0] for line in quarantine.read_text().splitlines()[1:]] == ['2', '9']
+    assert Decimal(str(backend.calculate_total_revenue(valid))) == expected_total()
+
+
+def test_pandas_path_matches(tmp_path):
+    pytest.importorskip("pandas")
+    from utils.backends import PandasBackend
+
+    data = tmp_path / "sales.txt"
+    write_rows(data)
+    python, pandas = PythonBackend(), PandasBackend()
+
+    df, invalid_count, _ = pandas.validate_and_filter(pandas.load(str(data)))
+    valid = python.validate_and_filter(python.load(str(data)))[0]
+
+    assert invalid_count == 2
+    assert pandas.to_records(df) == list(valid)
+    assert pandas.calculate_total_revenue(df) == python.calculate_total_revenue(valid)
+    assert pandas.region_wise_sales(df) == python.region_wise_sales(valid)
+    assert Decimal(str(pandas.calculate_total_revenue(df))) == expected_total()
+
+
+def test_report_total_is_exact(tmp_path):
+    data = tmp_path / "sales.txt"
+    write_rows(data)
+    backend = PythonBackend()
+    valid = backend.validate_and_filter(backend.load(str(data)))[0]
+
+    report = tmp_path / "report.txt"
+    generate_sales_report(valid, [], str(report))
+
+    line = next(l for l in report.read_text().splitlines() if l.startswith("Total Revenue:"))
+    assert line.split(":", 1)[1].strip() == f"{expected_total():,.2f}"
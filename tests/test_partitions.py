@@ -0,0 +1,51 @@
+import pytest
+
+from utils.partitions import write_partitions, select_partitions
+
+
+def make_rows(dates):
+    return [{'TransactionID': f'T{i}', 'Date': d, 'ProductID': 'P1', 'ProductName': 'Mouse',
+             'Quantity': 1, 'UnitPrice': 10.0, 'CustomerID': 'C1', 'Region': 'North'}
+            for i, d in enumerate(dates)]
+
+
+def test_select_partitions_prunes_by_date(tmp_path):
+    manifest = write_partitions(
+        make_rows(['2024-12-01', '2024-12-02', '2024-12-02', '2024-12-05']), str(tmp_path))
+    assert manifest['partitions']['2024-12-02']['rows'] == 2
+    assert select_partitions(manifest, '2024-12-02', '2024-12-04') == ['2024-12-02.txt']
+    assert len(select_partitions(manifest)) == 3
+
+
+def test_select_partitions_rejects_invalid_bound(tmp_path):
+    manifest = write_partitions(make_rows(['2024-12-01']), str(tmp_path))
+    with pytest.raises(ValueError):
+        select_partitions(manifest, '2024-13-45')
+
+
+def test_last_days_must_be_positive(tmp_path):
+    import main
+    from utils.partitions import last_days_range
+
+    manifest = write_partitions(make_rows(['2024-12-01', '2024-12-05']), str(tmp_path))
+    assert [d.isoformat() for d in last_days_range(manifest, 2)] == ['2024-12-04', '2024-12-05']
+    with pytest.raises(ValueError):
+        last_days_range(manifest, 0)
+    for days in ['0', '-3']:
+        with pytest.raises(SystemExit):
+            main.parse_args(['--read-partitions', str(tmp_path), '--last-days', days])
+
+
+def test_failed_write_keeps_existing_partition(tmp_path):
+    write_partitions(make_rows(['2024-12-01']), str(tmp_path))
+    before = sorted(p.name for p in tmp_path.iterdir())
+    partition = (tmp_path / '2024-12-01.txt').read_text()
+
+    broken = make_rows(['2024-12-01', '2024-12-01'])
+    del broken[1]['Region']
+    with pytest.raises(KeyError):
+        write_partitions(broken, str(tmp_path))
+
+    # no half-written partition and no temporary files left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == before
+    assert (tmp_path / '2024-12-01.txt').read_text() == partition
@@ -0,0 +1,92 @@
+# Quarantined rows must point at their real line in the input file
+
+import pytest
+
+import main
+from utils.backends import PythonBackend, PandasBackend
+
+ROWS = """TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region
+
+T001|2024-12-01|P101|Laptop|2|45000|C001|North
+X002|2024-12-01|P101|Laptop|2|45,000|C001|North
+
+T003|2024-12-01|P101|Laptop|0|45000|C001|North
+T004|2024-12-01|P101|Laptop|x|45000|C001|North
+T005|2024-12-01|P101|Laptop|1|45000|C001
+T006|2024-12-02|P102|Mouse|1|500|C002|South
+"""
+
+EXPECTED = [
+    "4|bad_transaction_id|X002|2024-12-01|P101|Laptop|2|45,000|C001|North",
+    "6|bad_quantity|T003|2024-12-01|P101|Laptop|0|45000|C001|North",
+    "7|bad_number|T004|2024-12-01|P101|Laptop|x|45000|C001|North",
+    "8|field_count|T005|2024-12-01|P101|Laptop|1|45000|C001",
+]
+
+
+def read_quarantine(path):
+    with open(path, encoding='utf-8') as file:
+        lines = file.read().splitlines()
+    assert lines[0] == "LineNo|Reason|RawLine"
+    return sorted(lines[1:])
+
+
+@pytest.mark.parametrize("backend_class", [PythonBackend, PandasBackend])
+def test_rejects_keep_file_line_and_raw_text(tmp_path, backend_class):
+    from utils.quarantine import QuarantineSink
+
+    if backend_class is PandasBackend:
+        pytest.importorskip("pandas")
+    data = tmp_path / "sales.txt"
+    data.write_text(ROWS, encoding='utf-8')
+    backend = backend_class()
+
+    with QuarantineSink(str(tmp_path / "q.txt")) as sink:
+        backend.validate_and_filter(backend.load(str(data), reject_sink=sink), reject_sink=sink)
+    assert read_quarantine(tmp_path / "q.txt") == EXPECTED
+
+    # several files: line numbers stay per file
+    with QuarantineSink(str(tmp_path / "many.txt")) as sink:
+        backend.validate_and_filter(
+            backend.load_many([str(data), str(data)], reject_sink=sink), reject_sink=sink)
+    assert read_quarantine(tmp_path / "many.txt") == sorted(EXPECTED * 2)
+
+
+def test_quarantine_flushed_when_every_row_is_rejected(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "sales_data.txt").write_text(
+        "\n".join(ROWS.splitlines()[:1] + [EXPECTED[-1].split("|", 2)[2]] * 3) + "\n",
+        encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+
+    main.main(["--quarantine", "q.txt"])
+
+    assert read_quarantine(tmp_path / "q.txt") == [
+        f"{n}|field_count|T005|2024-12-01|P101|Laptop|1|45000|C001" for n in (2, 3, 4)]
+
+
+def test_line_numbers_with_many_rejects(tmp_path):
+    from utils.quarantine import QuarantineSink
+
+    # blank lines, parse rejects and validation rejects interleaved
+    lines, expected = ["TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region"], []
+    for i in range(3000):
+        if i % 7 == 0:
+            lines.append("")
+        if i % 3 == 0:
+            row, reason = f"T{i}|2024-12-01|P101|Laptop|x|10|C1|North", "bad_number"
+        elif i % 5 == 0:
+            row, reason = f"T{i}|2024-12-01|P101|Laptop|0|10|C1|North", "bad_quantity"
+        else:
+            row, reason = f"T{i}|2024-12-01|P101|Laptop|1|10|C1|North", None
+        lines.append(row)
+        if reason:
+            expected.append(f"{len(lines)}|{reason}|{row}")
+    data = tmp_path / "sales.txt"
+    data.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+    backend = PythonBackend()
+    with QuarantineSink(str(tmp_path / "q.txt")) as sink:
+        backend.validate_and_filter(
+            backend.load_many([str(data)] * 3, reject_sink=sink), reject_sink=sink)
+    assert read_quarantine(tmp_path / "q.txt") == sorted(expected * 3)
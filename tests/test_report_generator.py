@@ -0,0 +1,44 @@
+# The report must not change when its aggregates spill to temporary files
+
+from tests.conftest import write_synthetic
+from utils import report_generator
+from utils.backends import PythonBackend
+from utils.report_generator import SpillingGroups, iter_sorted, _start_day, _add_day, _combine_day
+
+
+def build_report(path, transactions):
+    report_generator.generate_sales_report(transactions, [], output_file=path)
+    with open(path, encoding='utf-8') as file:
+        # the header carries the generation time
+        return [line for line in file if not line.startswith("Generated")]
+
+
+def test_spilled_report_matches_in_memory(tmp_path, monkeypatch):
+    data = tmp_path / "sales.txt"
+    write_synthetic(str(data), 3000, seed=7)
+    backend = PythonBackend()
+    transactions = backend.validate_and_filter(backend.load(str(data)))[0]
+
+    expected = build_report(str(tmp_path / "memory.txt"), transactions)
+
+    monkeypatch.setattr(report_generator, "REPORT_GROUP_LIMIT", 37)
+    monkeypatch.setattr(report_generator, "MAX_OPEN_RUNS", 3)
+    assert build_report(str(tmp_path / "spilled.txt"), transactions) == expected
+
+
+def test_spilling_groups_combine_runs():
+    groups = SpillingGroups(_start_day, _add_day, _combine_day, limit=4)
+    for i in range(40):
+        groups.add('d%d' % (i % 5), ('C%d' % (i % 3), 100))
+    assert groups.runs
+
+    spilled = {key: (agg[0], agg[1], sorted(agg[2])) for key, agg in groups.items()}
+    groups.close()
+
+    assert list(spilled) == sorted(spilled)
+    assert spilled['d0'] == (800, 8, ['C0', 'C1', 'C2'])
+
+
+def test_iter_sorted_spills_and_merges():
+    items = [(i * 7919) % 1000 for i in range(1000)]
+    assert list(iter_sorted(iter(items), limit=10)) == sorted(items)
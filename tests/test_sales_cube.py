@@ -0,0 +1,85 @@
+# SalesCube slices must equal data_processor on the filtered transactions
+
+import pytest
+
+from tests.conftest import write_synthetic
+from utils import data_processor
+from utils.backends import PythonBackend
+from utils.file_handler import validate_and_filter
+
+pytest.importorskip("numpy")
+
+from utils.sales_cube import SalesCube  # noqa: E402
+
+SLICES = [
+    {},
+    {'region': 'north'},
+    {'region': 'SOUTH', 'start_date': '2024-12-10'},
+    {'start_date': '2024-12-05', 'end_date': '2024-12-20'},
+    {'region': 'Nowhere'},
+    {'start_date': '2030-01-01'},
+]
+
+
+def mixed_case_rows():
+    rows = []
+    for i, (region, product, qty) in enumerate([
+            ('North', 'Mouse', 1), ('north', 'Mouse', 2), ('South', 'Laptop', 3),
+            ('NORTH', 'Laptop', 1), ('East', 'Webcam', 4)]):
+        rows.append({'TransactionID': f'T{i}', 'Date': f'2024-12-0{i + 1}', 'ProductID': 'P1',
+                     'ProductName': product, 'Quantity': qty, 'UnitPrice': 10.5,
+                     'CustomerID': 'C1', 'Region': region})
+    return rows
+
+
+def assert_parity(transactions, cube, region=None, start_date=None, end_date=None):
+    rows = validate_and_filter(transactions, region=region, start_date=start_date, end_date=end_date)[0]
+    dates = {'start_date': start_date, 'end_date': end_date}
+
+    assert cube.top_selling_products(None, region, **dates) == data_processor.top_selling_products(rows, n=None)
+    assert cube.top_selling_products(5, region, **dates) == data_processor.top_selling_products(rows)
+    for threshold in (10, 400):
+        assert (cube.low_performing_products(threshold, region, **dates)
+                == data_processor.low_performing_products(rows, threshold))
+    totals = cube.totals(region, **dates)
+    assert totals['revenue'] == data_processor.calculate_total_revenue(rows)
+    assert totals['transaction_count'] == len(rows)
+    assert totals['quantity'] == sum(t['Quantity'] for t in rows)
+    assert {day: (s['revenue'], s['transaction_count'])
+            for day, s in cube.daily_sales(region, **dates).items()} == {
+        day: (s['revenue'], s['transaction_count'])
+        for day, s in data_processor.daily_sales_trend(rows).items()}
+    if region is None:
+        assert cube.region_wise_sales(**dates) == data_processor.region_wise_sales(rows)
+
+
+def test_mixed_case_regions_are_summed():
+    rows = mixed_case_rows()
+    cube = SalesCube(rows)
+
+    assert cube.top_selling_products(1, region='north') == [('Mouse', 3, 31.5)]
+    assert cube.totals(region='North', product='Laptop')['quantity'] == 1
+    # grouping keeps the spellings apart, like region_wise_sales()
+    assert list(cube.region_wise_sales()) == ['East', 'South', 'north', 'North', 'NORTH']
+    for filters in SLICES + [{'region': 'North', 'end_date': '2024-12-02'}]:
+        assert_parity(rows, cube, **filters)
+
+
+@pytest.mark.parametrize("filters", SLICES)
+def test_cube_matches_data_processor(tmp_path, filters):
+    data = tmp_path / "sales.txt"
+    write_synthetic(str(data), 3000, seed=9)
+    backend = PythonBackend()
+    valid = list(backend.validate_and_filter(backend.load(str(data)))[0])
+    # mixed-case spellings of a region on some rows
+    for t in valid[::7]:
+        t['Region'] = t['Region'].upper()
+
+    assert_parity(valid, SalesCube(valid), **filters)
+
+
+def test_region_wise_sales_per_product():
+    rows = mixed_case_rows()
+    expected = data_processor.region_wise_sales([t for t in rows if t['ProductName'] == 'Laptop'])
+    assert SalesCube(rows).region_wise_sales(product='Laptop') == expected
+    assert SalesCube(rows).region_wise_sales(product='Nothing') == {}
@@ -0,0 +1,48 @@
+# Every shard report must equal a region-filtered single run
+
+import pytest
+
+from tests.conftest import write_synthetic
+from utils.api_handler import enrich_sales_data
+from utils.backends import PythonBackend
+from utils.file_handler import validate_and_filter
+from utils.report_generator import generate_sales_report
+from utils.sharding import generate_sharded_reports, shard_report_paths
+
+
+def read_report(path):
+    with open(path, encoding='utf-8') as file:
+        # the header carries the generation time
+        return [line for line in file if not line.startswith("Generated")]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_shards_match_filtered_runs(tmp_path, max_workers):
+    data = tmp_path / "sales.txt"
+    write_synthetic(str(data), 2000, seed=11)
+    backend = PythonBackend()
+    valid = backend.validate_and_filter(backend.load(str(data)))[0]
+    enriched = enrich_sales_data(valid, {})
+
+    reports = generate_sharded_reports(valid, enriched, output_dir=str(tmp_path / "out"),
+                                       max_workers=max_workers)
+    assert len(set(reports.values())) == len(reports)
+
+    expected = tmp_path / "expected.txt"
+    for region, path in reports.items():
+        if region == 'ALL':
+            rows = valid
+        else:
+            rows = validate_and_filter(valid, region=region)[0]
+        generate_sales_report(rows, enrich_sales_data(rows, {}), str(expected))
+        assert read_report(path) == read_report(expected), region
+
+
+def test_colliding_region_names_get_distinct_files():
+    paths = shard_report_paths(['North-East', 'North East', 'north_east_2', 'South'], "out")
+    assert paths == {
+        'North-East': 'out/sales_report_north_east.txt',
+        'North East': 'out/sales_report_north_east_2.txt',
+        'north_east_2': 'out/sales_report_north_east_2_2.txt',
+        'South': 'out/sales_report_south.txt',
+    }
@@ -0,0 +1,56 @@
+# --report-only must rebuild the same report a full run writes
+
+import os
+import shutil
+
+import pytest
+
+import main
+from tests.conftest import SAMPLE_FILE
+from utils.snapshot import SNAPSHOT_VERSION, load_snapshot, save_snapshot
+
+PRODUCTS = [
+    {'id': 101, 'title': 'Laptop', 'category': 'laptops', 'brand': 'Apple', 'rating': 4.7},
+    {'id': 102, 'title': 'Mouse', 'category': 'accessories', 'brand': 'Logi', 'rating': 4.1},
+    {'id': 104, 'title': 'Monitor', 'category': 'monitors', 'brand': 'Dell', 'rating': 4.4},
+]
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    shutil.copy(SAMPLE_FILE, tmp_path / "data" / "sales_data.txt")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('builtins.input', lambda prompt='': 'n')
+    monkeypatch.setattr(main, 'fetch_all_products', lambda: PRODUCTS)
+    return tmp_path
+
+
+def read_report(path):
+    with open(path, encoding='utf-8') as file:
+        # the header carries the generation time
+        return [line for line in file if not line.startswith("Generated")]
+
+
+def test_report_only_matches_full_run(workdir):
+    main.main([])
+    full = read_report("output/sales_report.txt")
+    assert any(line.startswith("Total Revenue:") for line in full)
+    os.remove("output/sales_report.txt")
+
+    main.main(["--report-only"])
+    assert read_report("output/sales_report.txt") == full
+
+
+def test_other_snapshot_version_is_refused(workdir, capsys):
+    main.main([])
+    snapshot = load_snapshot("output/analytics_snapshot.json.gz")
+    snapshot['version'] = SNAPSHOT_VERSION + 1
+    save_snapshot(snapshot, "output/analytics_snapshot.json.gz")
+    os.remove("output/sales_report.txt")
+    capsys.readouterr()
+
+    main.main(["--report-only"])
+
+    assert f"Snapshot version {SNAPSHOT_VERSION + 1} is not supported" in capsys.readouterr().out
+    assert not os.path.exists("output/sales_report.txt")
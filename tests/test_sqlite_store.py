@@ -0,0 +1,145 @@
+import os
+import shutil
+import sqlite3
+
+import pytest
+
+import main
+from tests.conftest import SAMPLE_FILE, write_synthetic
+from utils import data_processor
+from utils.backends import PythonBackend
+from utils.file_handler import validate_and_filter
+from utils.data_processor import region_wise_sales
+from utils import sqlite_store
+from utils.sqlite_store import SCHEMA, load_transactions, query_transactions, query_region_wise_sales
+
+# query_* function, data_processor function, extra arguments
+QUERIES = [
+    ('query_total_revenue', 'calculate_total_revenue', {}),
+    ('query_region_wise_sales', 'region_wise_sales', {}),
+    ('query_top_selling_products', 'top_selling_products', {}),
+    ('query_top_selling_products', 'top_selling_products', {'n': None}),
+    ('query_low_performing_products', 'low_performing_products', {}),
+    ('query_low_performing_products', 'low_performing_products', {'threshold': 400}),
+    ('query_customer_analysis', 'customer_analysis', {}),
+    ('query_daily_sales_trend', 'daily_sales_trend', {}),
+    ('query_peak_sales_day', 'find_peak_sales_day', {}),
+]
+
+FILTERS = [
+    {},
+    {'region': 'north'},
+    {'start_date': '2024-12-05', 'end_date': '2024-12-20'},
+    {'region': 'SOUTH', 'start_date': '2024-12-10'},
+]
+
+
+def make_rows():
+    rows = []
+    for i, region in enumerate(['North', 'north', 'South', 'NORTH', 'East']):
+        rows.append({'TransactionID': f'T{i}', 'Date': f'2024-12-0{i + 1}', 'ProductID': 'P1',
+                     'ProductName': 'Mouse', 'Quantity': i + 1, 'UnitPrice': 10.5,
+                     'CustomerID': 'C1', 'Region': region})
+    return rows
+
+
+def test_region_filter_uses_index_and_ignores_case():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA)
+    rows = make_rows()
+    load_transactions(conn, rows)
+
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT * FROM transactions"
+                        " WHERE region = ? COLLATE NOCASE", ('north',)).fetchall()
+    assert 'USING INDEX idx_transactions_region_nocase' in plan[0][-1]
+
+    expected = validate_and_filter(rows, region='north')[0]
+    assert query_transactions(conn, region='north') == expected
+
+    # grouping stays case-sensitive, like region_wise_sales()
+    assert query_region_wise_sales(conn) == region_wise_sales(rows)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_queries_match_data_processor(tmp_path, filters):
+    data = tmp_path / "sales.txt"
+    write_synthetic(str(data), 3000, seed=5)
+    backend = PythonBackend()
+    valid = list(backend.validate_and_filter(backend.load(str(data)))[0])
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA)
+    load_transactions(conn, valid)
+
+    rows = validate_and_filter(valid, **filters)[0]
+    assert query_transactions(conn, **filters) == rows
+    for query, function, kwargs in QUERIES:
+        expected = getattr(data_processor, function)(rows, **kwargs)
+        assert getattr(sqlite_store, query)(conn, **kwargs, **filters) == expected, query
+
+
+def test_replace_dates_keeps_other_days():
+    conn = sqlite3.connect(":memory:")
+    conn.executescript(SCHEMA)
+    rows = make_rows()
+    load_transactions(conn, rows)
+
+    changed = [dict(rows[1], Quantity=9), dict(rows[2], TransactionID='T9')]
+    load_transactions(conn, changed, replace_dates=[('2024-12-02', '2024-12-02'), ('2024-12-03', '2024-12-03')])
+
+    assert query_transactions(conn) == [rows[0], rows[3], rows[4]] + changed
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    (tmp_path / "data").mkdir()
+    shutil.copy(SAMPLE_FILE, tmp_path / "data" / "sales_data.txt")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('builtins.input', lambda prompt='': 'n')
+    monkeypatch.setattr(main, 'fetch_all_products', lambda: [
+        {'id': 101, 'title': 'Laptop', 'category': 'laptops', 'brand': 'Apple', 'rating': 4.7}])
+    return tmp_path
+
+
+def read_report(path):
+    with open(path, encoding='utf-8') as file:
+        return [line for line in file if not line.startswith("Generated")]
+
+
+def count_rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_report_from_sqlite_matches_full_run(workdir):
+    main.main(["--sqlite", "sales.db"])
+    full = read_report("output/sales_report.txt")
+    os.remove("output/sales_report.txt")
+
+    main.main(["--from-sqlite", "sales.db"])
+    assert read_report("output/sales_report.txt") == full
+
+    # date range: same as a full run with --since / --until
+    main.main(["--since", "2024-12-10", "--until", "2024-12-20"])
+    ranged = read_report("output/sales_report.txt")
+    main.main(["--from-sqlite", "sales.db", "--since", "2024-12-10", "--until", "2024-12-20"])
+    assert read_report("output/sales_report.txt") == ranged
+
+
+def test_partial_partition_read_only_replaces_its_dates(workdir, monkeypatch):
+    main.main(["--sqlite", "sales.db", "--write-partitions", "parts"])
+    total = count_rows("sales.db")
+    assert total > 0
+
+    calls = []
+    enrich = main.enrich_transactions
+    monkeypatch.setattr(main, 'enrich_transactions',
+                        lambda rows, *args: calls.append(len(rows)) or enrich(rows, *args))
+
+    main.main(["--sqlite", "sales.db", "--read-partitions", "parts", "--last-days", "3"])
+
+    assert count_rows("sales.db") == total
+    # every loaded row is enriched once, for both the report and the store
+    assert len(calls) == 1
@@ -0,0 +1,19 @@
+import pytest
+
+from utils.startup import HEAVY_MODULES, check_startup, measure_cold_start, measure_import_time
+
+
+def test_failing_snippet_is_an_error():
+    with pytest.raises(RuntimeError):
+        measure_cold_start("raise SystemExit(3)", runs=1)
+
+
+def test_main_does_not_import_heavy_modules():
+    timings = measure_import_time("main")
+    assert "main" in timings
+    assert not [name for name in timings if name.split(".")[0] in HEAVY_MODULES]
+
+
+def test_startup_within_budget():
+    problems, measurements = check_startup()
+    assert not problems, measurements
@@ -0,0 +1,97 @@
+# FileWatcher must hand over each complete line exactly once
+
+import os
+
+import pytest
+
+import main
+from utils.watcher import APPENDED, MISSING, REPLACED, UNCHANGED, FileWatcher
+
+ROW = "T{0}|2024-12-01|P101|Laptop|1|10|C1|North\n"
+
+
+def rows(*ids):
+    return "".join(ROW.format(i) for i in ids).encode()
+
+
+def append(path, data):
+    with open(path, 'ab') as file:
+        file.write(data)
+
+
+def test_appends_are_returned_once(tmp_path):
+    path = tmp_path / "sales.txt"
+    watcher = FileWatcher(str(path))
+    assert watcher.check() == (MISSING, b'')
+
+    path.write_bytes(rows(1, 2))
+    assert watcher.check() == (REPLACED, rows(1, 2))
+    assert watcher.check() == (UNCHANGED, b'')
+
+    append(path, rows(3))
+    assert watcher.check() == (APPENDED, rows(3))
+
+    # touched only
+    os.utime(path, ns=(1, 1))
+    assert watcher.check() == (UNCHANGED, b'')
+
+
+def test_partial_last_line_waits_for_its_newline(tmp_path):
+    path = tmp_path / "sales.txt"
+    path.write_bytes(rows(1))
+    watcher = FileWatcher(str(path))
+    watcher.check()
+
+    line = rows(2)
+    append(path, line[:10])
+    os.utime(path, ns=(2, 2))
+    assert watcher.check() == (UNCHANGED, b'')
+    append(path, line[10:])
+    assert watcher.check() == (APPENDED, line)
+
+
+def test_line_without_newline_is_taken_once_the_file_settles(tmp_path):
+    path = tmp_path / "sales.txt"
+    path.write_bytes(rows(1) + rows(2)[:-1])
+    watcher = FileWatcher(str(path))
+
+    assert watcher.check() == (REPLACED, rows(1))
+    assert watcher.check() == (APPENDED, rows(2)[:-1])
+    assert watcher.check() == (UNCHANGED, b'')
+
+    # the settled line turned out to be incomplete: start over
+    append(path, b"5\n")
+    assert watcher.check() == (REPLACED, rows(1) + rows(2)[:-1] + b"5\n")
+
+
+def test_rewrites_are_replaced_unless_content_is_the_same(tmp_path):
+    path = tmp_path / "sales.txt"
+    path.write_bytes(rows(1, 2, 3))
+    watcher = FileWatcher(str(path))
+    watcher.check()
+
+    # saved via a new file with the same content
+    other = tmp_path / "new.txt"
+    other.write_bytes(rows(1, 2, 3))
+    os.replace(other, path)
+    assert watcher.check() == (UNCHANGED, b'')
+
+    # truncated
+    path.write_bytes(rows(1))
+    assert watcher.check() == (REPLACED, rows(1))
+
+    # same size, last line edited in place
+    with open(path, 'r+b') as file:
+        file.write(rows(7))
+    os.utime(path, ns=(3, 3))
+    assert watcher.check() == (REPLACED, rows(7))
+
+
+@pytest.mark.parametrize("flag", [
+    ["--sqlite", "x.db"], ["--catalog", "c.csv"], ["--detail-endpoint", "http://x/{id}"],
+    ["--quarantine", "q.txt"], ["--write-partitions", "parts"], ["--backend", "python"],
+    ["--shard-by-region"],
+])
+def test_watch_rejects_flags_it_would_ignore(flag):
+    with pytest.raises(SystemExit):
+        main.parse_args(["--watch"] + flag)
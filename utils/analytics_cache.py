@@ -0,0 +1,177 @@
+# utils/analytics_cache.py
+
+import functools
+import os
+
+from utils.cache import LRUCache
+
+
+class Dataset(list):
+    """
+    A list of lines / transactions that knows where it came from
+
+    fingerprint is a hashable tuple: the source file identity (path,
+    device, inode, size, mtime) followed by every step applied to it,
+    e.g. ('file', ...) + ('parse',) + ('validate', 'North', None, ...).
+    Two datasets with the same fingerprint hold the same rows, so analysis
+    results can be shared between them without looking at the rows.
+
+    The rows are therefore read-only. Replacing, removing or reordering
+    rows drops the fingerprint (appending changes the length, which is
+    part of the cache key). Editing a row dict in place can't be seen, so
+    copy first, e.g. [dict(t) for t in dataset], which is a plain list.
+    """
+
+    def __init__(self, rows=(), fingerprint=None):
+        super().__init__(rows)
+        self.fingerprint = fingerprint
+
+    def _changed(self):
+        self.fingerprint = None
+
+    def __setitem__(self, index, value):
+        self._changed()
+        super().__setitem__(index, value)
+
+    def __delitem__(self, index):
+        self._changed()
+        super().__delitem__(index)
+
+    def __iadd__(self, rows):
+        self._changed()
+        return super().__iadd__(rows)
+
+    def __imul__(self, count):
+        self._changed()
+        return super().__imul__(count)
+
+    def insert(self, index, row):
+        self._changed()
+        super().insert(index, row)
+
+    def pop(self, index=-1):
+        self._changed()
+        return super().pop(index)
+
+    def remove(self, row):
+        self._changed()
+        super().remove(row)
+
+    def clear(self):
+        self._changed()
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._changed()
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._changed()
+        super().reverse()
+
+
+def file_fingerprint(filename):
+    """
+    Returns: cheap identity of a file's current contents (no hashing)
+    """
+    stat = os.stat(filename)
+    return ('file', os.path.realpath(filename), stat.st_dev, stat.st_ino,
+            stat.st_size, stat.st_mtime_ns)
+
+
+def derive(rows, source, *step):
+    """
+    Wraps `rows` in a Dataset whose fingerprint is source's plus `step`
+
+    Returns `rows` unchanged if source has no fingerprint.
+    """
+    fingerprint = getattr(source, 'fingerprint', None)
+    if fingerprint is None:
+        return rows
+    return Dataset(rows, fingerprint + (step,))
+
+
+_analytics_cache = LRUCache(maxsize=256)
+_enabled = True
+
+
+_CONTAINERS = (dict, list)
+
+
+def _copy(result):
+    # Analysis results are dicts and lists (each list holding one kind of
+    # item) of scalars, tuples of scalars and more dicts / lists; copying
+    # the dicts and lists is all it takes to keep callers from changing
+    # the cached value
+    if isinstance(result, dict):
+        copied = result.copy()
+        for key, value in copied.items():
+            if isinstance(value, _CONTAINERS):
+                copied[key] = _copy(value)
+        return copied
+    if isinstance(result, list):
+        if result and isinstance(result[0], _CONTAINERS):
+            return [_copy(value) for value in result]
+        return result[:]
+    return result
+
+
+def memoize(func):
+    """
+    Caches an analysis function's result per dataset and arguments
+
+    The first argument must be the transaction list. Only Datasets with a
+    fingerprint are cached; any other list is passed straight to func,
+    since nothing cheap tells whether its rows changed since the last call.
+    Every caller gets its own copy of the result.
+    """
+    @functools.wraps(func)
+    def wrapper(transactions, *args, **kwargs):
+        fingerprint = getattr(transactions, 'fingerprint', None)
+        if not _enabled or fingerprint is None:
+            return func(transactions, *args, **kwargs)
+
+        key = (func.__name__, fingerprint, len(transactions), args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return func(transactions, *args, **kwargs)
+
+        result = _analytics_cache.get(key)
+        if result is None:
+            # Two threads missing the same key both compute it; the results
+            # are equal, so the last put() simply wins
+            result = func(transactions, *args, **kwargs)
+            _analytics_cache.put(key, result)
+        return _copy(result)
+
+    return wrapper
+
+
+def analytics_cache_stats():
+    """
+    Returns: counters of the analysis result cache, plus the hit rate
+
+    Expected Output Format:
+    {'hits': 4, 'misses': 7, 'evictions': 0, 'size': 7, 'maxsize': 256,
+     'hit_rate': 36.36}
+    """
+    stats = _analytics_cache.stats()
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups * 100, 2) if lookups else 0.0
+    return stats
+
+
+def clear_analytics_cache():
+    _analytics_cache.clear()
+
+
+def set_analytics_cache_enabled(enabled):
+    """
+    Turns memoization on or off (e.g. for benchmarks); turning it off
+    also drops the cached results
+    """
+    global _enabled
+    _enabled = enabled
+    if not enabled:
+        _analytics_cache.clear()
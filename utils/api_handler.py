@@ -1,3 +1,6 @@
+from utils.cache import LRUCache
+from utils.file_handler import atomic_write
+
 # Task 3.1 Fetch Product Details
 
 # (a) Fetch All Products
@@ -108,35 +111,107 @@ def enrich_sales_data(transactions, product_mapping):
     - Include new columns in header
     """
 
+    lookup = get_enrichment_lookup(product_mapping)
     enriched_transactions = []
 
     for t in transactions:
         enriched_t = t.copy()  # Start with original transaction data
 
-        # Extract numeric product ID
         product_id_str = t['ProductID']
-        try:
-            numeric_id = int(''.join(filter(str.isdigit, product_id_str)))
-        except ValueError:
-            numeric_id = None
-
-        # Enrich with API data if available
-        if numeric_id and numeric_id in product_mapping:
-            product_info = product_mapping[numeric_id]
-            enriched_t['API_Category'] = product_info['category']
-            enriched_t['API_Brand'] = product_info['brand']
-            enriched_t['API_Rating'] = product_info['rating']
-            enriched_t['API_Match'] = True
-        else:
-            enriched_t['API_Category'] = None
-            enriched_t['API_Brand'] = None
-            enriched_t['API_Rating'] = None
-            enriched_t['API_Match'] = False
+        info = lookup.get(product_id_str)
+        if info is None:
+            info = lookup.resolve(product_id_str)
+
+        (enriched_t['API_Category'], enriched_t['API_Brand'],
+         enriched_t['API_Rating'], enriched_t['API_Match']) = info
 
         enriched_transactions.append(enriched_t)
 
     return enriched_transactions
 
+# Enrichment lookup table (ProductID string -> enrichment tuple)
+
+_NO_MATCH = (None, None, None, False)
+_lookup_cache = LRUCache(maxsize=4096)
+_lookup_version = None
+
+
+def catalog_version(product_mapping):
+    """
+    Returns a fingerprint of the product mapping
+
+    Two mappings with the same ids and enrichment fields give the same
+    version, so the lookup table is only rebuilt when the catalog changes.
+    """
+    return hash(tuple(
+        (product_id, info.get('category'), info.get('brand'), info.get('rating'))
+        for product_id, info in product_mapping.items()
+    ))
+
+
+def _resolve_product_id(product_id_str, product_mapping):
+    # Extract numeric product ID (P101 -> 101)
+    try:
+        numeric_id = int(''.join(filter(str.isdigit, product_id_str)))
+    except ValueError:
+        numeric_id = None
+
+    if numeric_id and numeric_id in product_mapping:
+        product_info = product_mapping[numeric_id]
+        return (product_info['category'], product_info['brand'],
+                product_info['rating'], True)
+    return _NO_MATCH
+
+
+class EnrichmentLookup(dict):
+    """
+    Per-run lookup table: ProductID string -> (category, brand, rating, match)
+
+    Each row costs a single dict hit. The first time a ProductID is seen,
+    resolve() fetches it from the shared LRU cache (or computes it) and
+    stores it here.
+    """
+
+    def __init__(self, product_mapping, version):
+        super().__init__()
+        self.product_mapping = product_mapping
+        self.version = version
+
+    def resolve(self, product_id_str):
+        key = (self.version, product_id_str)
+        info = _lookup_cache.get(key)
+        if info is None:
+            info = _resolve_product_id(product_id_str, self.product_mapping)
+            _lookup_cache.put(key, info)
+        self[product_id_str] = info
+        return info
+
+
+def get_enrichment_lookup(product_mapping):
+    """
+    Returns an EnrichmentLookup for the given product mapping
+
+    The shared LRU cache is cleared whenever the catalog version changes.
+    """
+    global _lookup_version
+
+    version = catalog_version(product_mapping)
+    if version != _lookup_version:
+        _lookup_cache.clear()
+        _lookup_version = version
+
+    return EnrichmentLookup(product_mapping, version)
+
+
+def enrichment_cache_stats():
+    """
+    Returns: hit / miss / eviction counters of the enrichment lookup cache
+
+    Expected Output Format:
+    {'hits': 60, 'misses': 10, 'evictions': 0, 'size': 10, 'maxsize': 4096}
+    """
+    return _lookup_cache.stats()
+
 # helper function
 
 
@@ -153,9 +228,12 @@ def save_enriched_data(enriched_transactions, filename='data/enriched_sales_data
     - Create output file with all original + new fields
     - Use pipe delimiter
     - Handle None values appropriately
+
+    The file is written to a temporary file and renamed into place, so
+    readers never see a partly written file.
     """
 
-    with open(filename, 'w', encoding='utf-8') as file:
+    with atomic_write(filename) as file:
         # Write header
         header = [
             "TransactionID", "Date", "ProductID", "ProductName",
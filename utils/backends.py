@@ -0,0 +1,474 @@
+# utils/backends.py
+
+import os
+from datetime import date
+
+from utils.file_handler import (
+    SourcedRows, read_sales_data, parse_transactions, validate_and_filter, parse_date, parse_date_range
+)
+from utils.money import MINOR_UNITS, from_minor_units
+from utils.quarantine import (
+    FIELD_COUNT, BAD_NUMBER, BAD_TRANSACTION_ID, BAD_PRODUCT_ID,
+    BAD_CUSTOMER_ID, BAD_QUANTITY, BAD_UNIT_PRICE, SUB_CENT_PRICE
+)
+from utils.data_processor import (
+    calculate_total_revenue,
+    region_wise_sales,
+    top_selling_products,
+    customer_analysis,
+    daily_sales_trend,
+    find_peak_sales_day,
+    low_performing_products
+)
+
+BACKEND_ENV_VAR = "SALES_ANALYTICS_BACKEND"
+
+COLUMNS = [
+    'TransactionID', 'Date', 'ProductID', 'ProductName',
+    'Quantity', 'UnitPrice', 'CustomerID', 'Region'
+]
+
+
+class PythonBackend:
+    """
+    Default backend: plain lists of transaction dictionaries
+
+    Every method delegates to the functions in utils.file_handler and
+    utils.data_processor, so results are exactly what those return.
+    """
+
+    name = "python"
+
+    def __init__(self):
+        # Raw (non-empty, non-header) lines seen by the last load / load_many
+        self.lines_read = 0
+
+    def load(self, filename, reject_sink=None):
+        raw_lines = read_sales_data(filename)
+        self.lines_read = len(raw_lines)
+        return parse_transactions(raw_lines, reject_sink=reject_sink)
+
+    def load_many(self, filenames, reject_sink=None):
+        transactions = []
+        offsets = []
+        parts = []
+        lines_read = 0
+        for filename in filenames:
+            part = self.load(filename, reject_sink=reject_sink)
+            offsets.append(len(transactions))
+            parts.append(part)
+            transactions.extend(part)
+            lines_read += self.lines_read
+        self.lines_read = lines_read
+
+        if reject_sink is not None:
+            # keep each file's rows reachable, so validation rejects are
+            # quarantined by their line in that file
+            transactions = SourcedRows(transactions)
+            transactions.offsets = offsets
+            transactions.parts = parts
+        return transactions
+
+    def filter_options(self, transactions):
+        regions = sorted(
+            {t["Region"] for t in transactions if "Region" in t and t["Region"]})
+        amounts = [t["Quantity"] * t["UnitPrice"] for t in transactions]
+        min_amt = min(amounts) if amounts else 0
+        max_amt = max(amounts) if amounts else 0
+        return regions, min_amt, max_amt
+
+    def validate_and_filter(self, transactions, region=None, min_amount=None, max_amount=None, reject_sink=None,
+                            start_date=None, end_date=None):
+        return validate_and_filter(transactions, region=region,
+                                   min_amount=min_amount, max_amount=max_amount,
+                                   reject_sink=reject_sink,
+                                   start_date=start_date, end_date=end_date)
+
+    def to_records(self, transactions):
+        return transactions
+
+    def calculate_total_revenue(self, transactions):
+        return calculate_total_revenue(transactions)
+
+    def region_wise_sales(self, transactions):
+        return region_wise_sales(transactions)
+
+    def top_selling_products(self, transactions, n=5):
+        return top_selling_products(transactions, n=n)
+
+    def customer_analysis(self, transactions):
+        return customer_analysis(transactions)
+
+    def daily_sales_trend(self, transactions):
+        return daily_sales_trend(transactions)
+
+    def find_peak_sales_day(self, transactions):
+        return find_peak_sales_day(transactions)
+
+    def low_performing_products(self, transactions, threshold=10):
+        return low_performing_products(transactions, threshold=threshold)
+
+
+class PandasBackend:
+    """
+    Vectorized backend: transactions are held in a pandas DataFrame
+
+    Returns the same Python structures (dicts, lists of tuples) as the
+    functions in utils.data_processor, so callers can switch backends freely.
+    pandas is imported on first use only.
+    """
+
+    name = "pandas"
+
+    def __init__(self):
+        import pandas
+        self.pd = pandas
+        # Raw (non-empty, non-header) lines seen by the last load / load_many
+        self.lines_read = 0
+
+    # Task 1: Loading, parsing and validation
+
+    def load(self, filename, reject_sink=None):
+        """
+        Reads the pipe-delimited sales file into a DataFrame
+
+        Same cleaning rules as parse_transactions():
+        - rows without exactly 8 fields are dropped
+        - commas in ProductName become spaces
+        - thousands separators are removed from Quantity and UnitPrice
+        - rows whose Quantity / UnitPrice do not convert are dropped
+
+        read_csv pads short rows with empty strings, which can't be told
+        apart from real empty fields (e.g. a blank Region), so lines are read
+        whole and split with vectorized string operations instead.
+        """
+        import csv
+
+        pd = self.pd
+        self.lines_read = 0
+
+        lines = None
+        for encoding in ['utf-8', 'latin-1', 'cp1252']:
+            try:
+                lines = pd.read_csv(
+                    filename,
+                    sep='\x1e',
+                    header=None,
+                    names=['line'],
+                    dtype=str,
+                    keep_default_na=False,
+                    quoting=csv.QUOTE_NONE,
+                    skip_blank_lines=False,
+                    encoding=encoding
+                )['line'].str.strip()
+                break
+            except UnicodeDecodeError:
+                continue
+            except FileNotFoundError:
+                print(f"Error: File not found - {filename}")
+                return pd.DataFrame(columns=COLUMNS)
+
+        if lines is None:
+            print("Error: Unable to read file due to encoding issues.")
+            return pd.DataFrame(columns=COLUMNS)
+
+        # Skip empty lines and header, keep rows with exactly 8 fields.
+        # The index stays the 0-based line position in the file.
+        lines = lines[(lines != '') & ~lines.str.lower().str.startswith('transactionid')]
+        self.lines_read = len(lines)
+
+        fields_ok = lines.str.count('\\|') == 7
+        if reject_sink is not None:
+            self._quarantine_lines(reject_sink, lines[~fields_ok], FIELD_COUNT)
+        lines = lines[fields_ok]
+
+        df = lines.str.split('|', expand=True)
+        df.columns = COLUMNS[:len(df.columns)]
+        if len(df.columns) != len(COLUMNS):
+            return pd.DataFrame(columns=COLUMNS)
+
+        for column in ['TransactionID', 'Date', 'ProductID', 'CustomerID', 'Region']:
+            df[column] = df[column].str.strip()
+        df['ProductName'] = df['ProductName'].str.replace(
+            ',', ' ', regex=False).str.strip()
+
+        # Clean numbers: remove thousands separators
+        quantity = df['Quantity'].str.replace(',', '', regex=False).str.strip()
+        unit_price = pd.to_numeric(
+            df['UnitPrice'].str.replace(',', '', regex=False).str.strip(),
+            errors='coerce')
+
+        keep = quantity.str.fullmatch(r'[+-]?\d+') & unit_price.notna()
+        if reject_sink is not None:
+            self._quarantine_lines(reject_sink, lines[~keep], BAD_NUMBER)
+        df = df[keep].copy()
+        df['Quantity'] = quantity[keep].astype('int64')
+        df['UnitPrice'] = unit_price[keep].astype('float64')
+        if reject_sink is not None:
+            # validate_and_filter() quarantines by file line and raw text
+            df['LineNo'] = df.index + 1
+            df['RawLine'] = lines[keep]
+        return df.reset_index(drop=True)
+
+    def load_many(self, filenames, reject_sink=None):
+        frames = []
+        lines_read = 0
+        for filename in filenames:
+            frames.append(self.load(filename, reject_sink=reject_sink))
+            lines_read += self.lines_read
+        self.lines_read = lines_read
+        if not frames:
+            return self.pd.DataFrame(columns=COLUMNS)
+        return self.pd.concat(frames, ignore_index=True)
+
+    def _quarantine_lines(self, reject_sink, rejected_lines, reason):
+        # Index is the position of the line in the file (0-based)
+        for index, line in rejected_lines.items():
+            reject_sink.reject(index + 1, line, reason)
+
+    def filter_options(self, df):
+        regions = sorted(r for r in df['Region'].unique() if r)
+        amounts = df['Quantity'] * df['UnitPrice']
+        min_amt = float(amounts.min()) if len(df) else 0
+        max_amt = float(amounts.max()) if len(df) else 0
+        return regions, min_amt, max_amt
+
+    def validate_and_filter(self, df, region=None, min_amount=None, max_amount=None, reject_sink=None,
+                            start_date=None, end_date=None):
+        """
+        DataFrame version of validate_and_filter()
+
+        Returns: (filtered DataFrame, invalid_count, filter_summary)
+        """
+        total_input = len(df)
+        start, end = parse_date_range(start_date, end_date)
+
+        # Same order as validate_and_filter(): the first failed check is
+        # the reject reason
+        cents = df['UnitPrice'] * MINOR_UNITS
+        checks = [
+            (BAD_TRANSACTION_ID, df['TransactionID'].str.startswith('T')),
+            (BAD_PRODUCT_ID, df['ProductID'].str.startswith('P')),
+            (BAD_CUSTOMER_ID, df['CustomerID'].str.startswith('C')),
+            (BAD_QUANTITY, df['Quantity'] > 0),
+            (BAD_UNIT_PRICE, df['UnitPrice'] > 0),
+            (SUB_CENT_PRICE, (cents - cents.round()).abs() < 1e-6)
+        ]
+
+        valid = checks[0][1]
+        for reason, passed in checks[1:]:
+            valid = valid & passed
+        invalid_count = int((~valid).sum())
+
+        if reject_sink is not None and invalid_count:
+            failed = [passed[~valid].to_numpy() for reason, passed in checks]
+            reasons = [next(code for (code, _), ok in zip(checks, failed) if not ok[row])
+                       for row in range(invalid_count)]
+            if 'LineNo' in df.columns:
+                rejected = df[~valid]
+                for line_no, raw_line, reason in zip(rejected['LineNo'], rejected['RawLine'], reasons):
+                    reject_sink.reject(int(line_no), raw_line, reason)
+            else:
+                # loaded without a sink: position and rebuilt line
+                records = df[~valid][COLUMNS].to_dict('records')
+                positions = [i for i, ok in enumerate(valid.to_numpy(), start=1) if not ok]
+                for record_no, t, reason in zip(positions, records, reasons):
+                    reject_sink.reject_record(record_no, t, reason)
+
+        filtered = df[valid]
+
+        filtered_by_region = 0
+        filtered_by_amount = 0
+        filtered_by_date = 0
+
+        if region:
+            before = len(filtered)
+            filtered = filtered[filtered['Region'].str.lower() == region.lower()]
+            filtered_by_region += before - len(filtered)
+
+        amount = filtered['Quantity'] * filtered['UnitPrice']
+        if min_amount is not None:
+            before = len(filtered)
+            keep = amount >= min_amount
+            filtered, amount = filtered[keep], amount[keep]
+            filtered_by_amount += before - len(filtered)
+
+        if max_amount is not None:
+            before = len(filtered)
+            filtered = filtered[amount <= max_amount]
+            filtered_by_amount += before - len(filtered)
+
+        if start is not None or end is not None:
+            start = start or date.min
+            end = end or date.max
+
+            # Few distinct dates: parse each once and map back
+            in_range = {
+                d: parse_date(d) is not None and start <= parse_date(d) <= end
+                for d in filtered['Date'].unique()
+            }
+            before = len(filtered)
+            filtered = filtered[filtered['Date'].map(in_range).astype(bool)]
+            filtered_by_date += before - len(filtered)
+
+        filter_summary = {
+            'total_input': total_input,
+            'invalid_count': invalid_count,
+            'filtered_by_region': filtered_by_region,
+            'filtered_by_amount': filtered_by_amount,
+            'filtered_by_date': filtered_by_date,
+            'total_output': len(filtered)
+        }
+
+        return filtered.reset_index(drop=True), invalid_count, filter_summary
+
+    def to_records(self, df):
+        records = df[COLUMNS].to_dict('records')
+        for t in records:
+            t['Quantity'] = int(t['Quantity'])
+            t['UnitPrice'] = float(t['UnitPrice'])
+        return records
+
+    # Task 2: Analysis
+
+    def _amount(self, df):
+        # Quantity * UnitPrice in integer minor units, like utils.money
+        cents = (df['UnitPrice'] * MINOR_UNITS).round().astype('int64')
+        return df['Quantity'] * cents
+
+    def _with_amount(self, df):
+        return df.assign(Amount=self._amount(df))
+
+    def _product_totals(self, df):
+        totals = self._with_amount(df).groupby('ProductName', sort=False).agg(
+            total_quantity=('Quantity', 'sum'),
+            total_revenue=('Amount', 'sum')
+        )
+        return totals
+
+    def calculate_total_revenue(self, df):
+        return round(from_minor_units(int(self._amount(df).sum())), 2)
+
+    def region_wise_sales(self, df):
+        total_revenue = self.calculate_total_revenue(df)
+
+        grouped = self._with_amount(df).groupby('Region', sort=False).agg(
+            total_sales=('Amount', 'sum'),
+            transaction_count=('Amount', 'size')
+        )
+
+        region_stats = {}
+        for region, row in grouped.iterrows():
+            total_sales = round(from_minor_units(int(row['total_sales'])), 2)
+            region_stats[region] = {
+                'total_sales': total_sales,
+                'transaction_count': int(row['transaction_count']),
+                'percentage': round(
+                    (total_sales / total_revenue) * 100, 2) if total_revenue > 0 else 0.0
+            }
+
+        return dict(
+            sorted(region_stats.items(),
+                   key=lambda item: item[1]['total_sales'],
+                   reverse=True)
+        )
+
+    def top_selling_products(self, df, n=5):
+        totals = self._product_totals(df).sort_values(
+            'total_quantity', ascending=False, kind='stable')
+        result = [
+            (product, int(row['total_quantity']), round(from_minor_units(int(row['total_revenue'])), 2))
+            for product, row in totals.iterrows()
+        ]
+        return result[:n]
+
+    def customer_analysis(self, df):
+        grouped = self._with_amount(df).groupby('CustomerID', sort=False).agg(
+            total_spent=('Amount', 'sum'),
+            purchase_count=('Amount', 'size'),
+            products_bought=('ProductName', lambda names: sorted(set(names)))
+        )
+
+        customer_stats = {}
+        for customer, row in grouped.iterrows():
+            spent = from_minor_units(int(row['total_spent']))
+            count = int(row['purchase_count'])
+            customer_stats[customer] = {
+                'total_spent': round(spent, 2),
+                'purchase_count': count,
+                'products_bought': row['products_bought'],
+                'avg_order_value': round(spent / count, 2) if count > 0 else 0.0
+            }
+
+        return dict(
+            sorted(customer_stats.items(),
+                   key=lambda item: item[1]['total_spent'],
+                   reverse=True)
+        )
+
+    def daily_sales_trend(self, df):
+        grouped = self._with_amount(df).groupby('Date', sort=True).agg(
+            revenue=('Amount', 'sum'),
+            transaction_count=('Amount', 'size'),
+            unique_customers=('CustomerID', 'nunique')
+        )
+
+        return {
+            date: {
+                'revenue': round(from_minor_units(int(row['revenue'])), 2),
+                'transaction_count': int(row['transaction_count']),
+                'unique_customers': int(row['unique_customers'])
+            }
+            for date, row in grouped.iterrows()
+        }
+
+    def find_peak_sales_day(self, df):
+        peak_date = None
+        peak_revenue = 0.0
+        peak_transactions = 0
+
+        for date, stats in self.daily_sales_trend(df).items():
+            if stats['revenue'] > peak_revenue:
+                peak_revenue = stats['revenue']
+                peak_date = date
+                peak_transactions = stats['transaction_count']
+
+        return (peak_date, peak_revenue, peak_transactions)
+
+    def low_performing_products(self, df, threshold=10):
+        totals = self._product_totals(df)
+        totals = totals[totals['total_quantity'] < threshold].sort_values(
+            'total_quantity', kind='stable')
+        return [
+            (product, int(row['total_quantity']), round(from_minor_units(int(row['total_revenue'])), 2))
+            for product, row in totals.iterrows()
+        ]
+
+
+BACKENDS = {
+    'python': PythonBackend,
+    'pandas': PandasBackend
+}
+
+
+def get_backend(name=None):
+    """
+    Returns an analytics backend instance
+
+    - name: 'python' or 'pandas'. When None, the SALES_ANALYTICS_BACKEND
+      environment variable is used (default 'python')
+    - Falls back to the python backend if pandas is not installed
+    """
+    if name is None:
+        name = os.environ.get(BACKEND_ENV_VAR, 'python')
+    name = name.strip().lower()
+
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown backend '{name}'. Choose from: {', '.join(BACKENDS)}")
+
+    try:
+        return BACKENDS[name]()
+    except ImportError as e:
+        print(f"Backend '{name}' unavailable ({e}). Using python backend.")
+        return PythonBackend()
@@ -0,0 +1,66 @@
+# utils/cache.py
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Small bounded cache with least-recently-used eviction
+
+    - maxsize: maximum number of entries kept (oldest entry is evicted first)
+    - hits / misses / evictions counters are kept so the cache can be sized
+
+    All operations take an internal lock, so one instance can be shared
+    between threads.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            self._data[key] = value
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """
+        Returns: dictionary of cache counters
+
+        Expected Output Format:
+        {'hits': 70, 'misses': 10, 'evictions': 0, 'size': 10, 'maxsize': 1024}
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data),
+                'maxsize': self.maxsize
+            }
@@ -0,0 +1,273 @@
+# utils/catalog_sources.py
+
+import csv
+import json
+import threading
+import time
+
+from utils.api_handler import _resolve_product_id
+
+# Enrichment tuples use the same layout as utils.api_handler:
+# (API_Category, API_Brand, API_Rating, API_Match)
+
+
+def _numeric_id(product_id):
+    # P101 -> 101, 'P5' -> 5, None if there are no digits
+    digits = ''.join(filter(str.isdigit, str(product_id)))
+    return int(digits) if digits else None
+
+
+def _entry(product):
+    rating = product.get('rating')
+    try:
+        rating = float(rating) if rating not in (None, '') else None
+    except (TypeError, ValueError):
+        rating = None
+    return (product.get('category') or None, product.get('brand') or None, rating, True)
+
+
+class LocalCatalogSource:
+    """
+    Product catalog from a local CSV or JSON file
+
+    CSV: header with an id column ('ProductID' or 'id') plus any of
+         'category', 'brand', 'rating'
+    JSON: a list of product objects, or {'products': [...]} as returned
+          by the DummyJSON API
+
+    Entries match a transaction ProductID exactly ('P101'), or by its
+    numeric part when the catalog uses numeric ids (101 or '101').
+    """
+
+    remote = False
+
+    def __init__(self, filename):
+        self.name = filename
+        self.by_id = {}
+        self.by_number = {}
+
+        if filename.lower().endswith('.json'):
+            with open(filename, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            products = data.get('products', []) if isinstance(data, dict) else data
+        else:
+            with open(filename, 'r', encoding='utf-8', newline='') as file:
+                products = list(csv.DictReader(file))
+
+        for product in products:
+            if not isinstance(product, dict):
+                continue
+            product_id = product.get('ProductID', product.get('id'))
+            if product_id in (None, ''):
+                continue
+            entry = _entry(product)
+            if isinstance(product_id, int) or str(product_id).strip().isdigit():
+                self.by_number[int(product_id)] = entry
+            else:
+                self.by_id[str(product_id).strip()] = entry
+
+    def lookup(self, product_id):
+        entry = self.by_id.get(product_id)
+        if entry is None and self.by_number:
+            entry = self.by_number.get(_numeric_id(product_id))
+        return entry
+
+
+class MappingSource:
+    """
+    Fallback source wrapping a create_product_mapping() dictionary
+
+    Uses the same numeric-id matching as enrich_sales_data().
+    """
+
+    remote = False
+
+    def __init__(self, product_mapping, name="api_mapping"):
+        self.name = name
+        self.product_mapping = product_mapping
+
+    def lookup(self, product_id):
+        entry = _resolve_product_id(product_id, self.product_mapping)
+        return entry if entry[3] else None
+
+
+class RateLimiter:
+    """
+    Allows at most `rate` calls per second across all threads
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class DetailEndpointSource:
+    """
+    Per-ID product detail endpoint, e.g. https://dummyjson.com/products/{id}
+
+    - url_template: '{id}' is replaced by the numeric ProductID and
+      '{product_id}' by the full ProductID string
+    - rate: maximum requests per second (shared by all worker threads)
+
+    Concurrent lookups of the same ProductID are coalesced into one
+    request, and results (including misses) are cached for the lifetime of
+    the source.
+    """
+
+    remote = True
+
+    def __init__(self, url_template, rate=10, timeout=5):
+        self.name = url_template
+        self.url_template = url_template
+        self.timeout = timeout
+        self.limiter = RateLimiter(rate)
+        self.requests_made = 0
+        self._results = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, product_id):
+        with self._lock:
+            if product_id in self._results:
+                return self._results[product_id]
+            event = self._inflight.get(product_id)
+            owner = event is None
+            if owner:
+                event = self._inflight[product_id] = threading.Event()
+
+        if not owner:
+            # Someone else is fetching this id - wait for their result
+            event.wait()
+            return self._results.get(product_id)
+
+        entry = None
+        try:
+            entry = self._fetch(product_id)
+        finally:
+            with self._lock:
+                self._results[product_id] = entry
+                del self._inflight[product_id]
+            event.set()
+        return entry
+
+    def _fetch(self, product_id):
+        import requests
+
+        numeric_id = _numeric_id(product_id)
+        if numeric_id is None and '{id}' in self.url_template:
+            return None
+        url = self.url_template.format(id=numeric_id, product_id=product_id)
+
+        self.limiter.wait()
+        with self._lock:
+            self.requests_made += 1
+
+        try:
+            response = requests.get(url, timeout=self.timeout)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            product = response.json()
+            # anything but a product object (e.g. a list) is a miss
+            if not isinstance(product, dict):
+                return None
+            return _entry(product)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Error fetching {url}: {e}")
+            return None
+
+
+def _lookup_local(sources, product_id):
+    """
+    Walks the sources until a hit or the first remote source
+
+    Returns: (entry, index of the matching source), (None, index of the
+    remote source still to try), or (None, None) when nothing matched
+    """
+    for index, source in enumerate(sources):
+        if source.remote:
+            return None, index
+        entry = source.lookup(product_id)
+        if entry is not None:
+            return entry, index
+    return None, None
+
+
+def _lookup_from(sources, product_id, start):
+    # Continues the priority walk from sources[start] (runs in a worker thread)
+    for index in range(start, len(sources)):
+        entry = sources[index].lookup(product_id)
+        if entry is not None:
+            return entry, index
+    return None, None
+
+
+def enrich_from_sources(transactions, sources, max_workers=8):
+    """
+    Enriches transactions from several catalog sources
+
+    Parameters:
+    - transactions: list of transaction dictionaries
+    - sources: catalog sources in priority order (first hit wins)
+    - max_workers: thread pool size for remote lookups
+
+    Each distinct ProductID is resolved once. Local sources are checked
+    first in the calling thread; only IDs they can't settle before the
+    first remote source are sent to the thread pool.
+
+    Returns: (enriched transactions, stats)
+    stats = {'distinct_ids': 10, 'remote_ids': 4, 'matched_by': {source name: count}}
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    resolved = {}
+    pending = {}
+
+    for product_id in dict.fromkeys(t['ProductID'] for t in transactions):
+        entry, index = _lookup_local(sources, product_id)
+        if entry is None and index is not None:
+            pending[product_id] = index
+        else:
+            resolved[product_id] = (entry, index)
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                product_id: pool.submit(_lookup_from, sources, product_id, index)
+                for product_id, index in pending.items()
+            }
+            for product_id, future in futures.items():
+                resolved[product_id] = future.result()
+
+    matched_by = {}
+    for entry, index in resolved.values():
+        if entry is not None:
+            name = sources[index].name
+            matched_by[name] = matched_by.get(name, 0) + 1
+
+    no_match = (None, None, None, False)
+    enriched_transactions = []
+    for t in transactions:
+        enriched_t = t.copy()
+        entry = resolved[t['ProductID']][0] or no_match
+        (enriched_t['API_Category'], enriched_t['API_Brand'],
+         enriched_t['API_Rating'], enriched_t['API_Match']) = entry
+        enriched_transactions.append(enriched_t)
+
+    stats = {
+        'distinct_ids': len(resolved),
+        'remote_ids': len(pending),
+        'matched_by': matched_by
+    }
+    return enriched_transactions, stats
@@ -0,0 +1,173 @@
+# utils/cohort_analysis.py
+
+from datetime import date
+
+from utils.file_handler import parse_date
+from utils.money import line_amount, from_minor_units
+
+
+def _month_index(d):
+    # Months since year 0, so month offsets are a plain subtraction
+    return d.year * 12 + d.month - 1
+
+
+def _month_label(index):
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def analyze_cohorts(transactions):
+    """
+    Per-customer purchase sequence metrics and monthly cohorts
+
+    All transactions are sorted once by (CustomerID, Date); every metric
+    is then computed in a single linear pass over that order, so no
+    per-customer grouping or sorting is needed. Rows with an unparseable
+    Date are skipped.
+
+    A "purchase day" is a distinct date a customer bought on; several
+    transactions on the same day count as one visit. A customer is a
+    repeat customer if they have more than one purchase day.
+
+    Returns: (customers, cohorts)
+
+    Expected Output Format:
+    customers = {
+        'C001': {
+            'cohort': '2024-12',
+            'first_purchase': '2024-12-01',
+            'last_purchase': '2024-12-20',
+            'purchase_count': 4,
+            'purchase_days': 3,
+            'total_spent': 182300.0,
+            'avg_days_between': 9.5,      # None with a single purchase day
+            'max_days_between': 12,       # None with a single purchase day
+            'repeat': True
+        },
+        ...
+    }
+    cohorts = {
+        '2024-12': [12, 7, 3],  # active customers in month 0, 1, 2 after first purchase
+        ...
+    }
+    """
+    rows = []
+    for t in transactions:
+        d = parse_date(t['Date'])
+        if d is not None:
+            rows.append((t['CustomerID'], d.toordinal(), _month_index(d), line_amount(t)))
+
+    # The one global sort
+    rows.sort()
+
+    customers = {}
+    cohorts = {}
+
+    current = None
+    for customer, day, month, amount in rows:
+        if customer != current:
+            if current is not None:
+                _finish_customer(customers, cohorts, current, first_day, last_day,
+                                 count, days, spent, gap_max, months)
+            current = customer
+            first_day = last_day = day
+            count = 0
+            days = 1
+            spent = 0
+            gap_max = None
+            months = [month]
+        elif day != last_day:
+            gap = day - last_day
+            gap_max = gap if gap_max is None or gap > gap_max else gap_max
+            days += 1
+            last_day = day
+            if month != months[-1]:
+                months.append(month)
+
+        count += 1
+        spent += amount
+
+    if current is not None:
+        _finish_customer(customers, cohorts, current, first_day, last_day,
+                         count, days, spent, gap_max, months)
+
+    return customers, dict(sorted(cohorts.items()))
+
+
+def _finish_customer(customers, cohorts, customer, first_day, last_day,
+                     count, days, spent, gap_max, months):
+    cohort = _month_label(months[0])
+    customers[customer] = {
+        'cohort': cohort,
+        'first_purchase': date.fromordinal(first_day).isoformat(),
+        'last_purchase': date.fromordinal(last_day).isoformat(),
+        'purchase_count': count,
+        'purchase_days': days,
+        'total_spent': round(from_minor_units(spent), 2),
+        # the gaps between purchase days add up to last - first
+        'avg_days_between': round((last_day - first_day) / (days - 1), 2) if days > 1 else None,
+        'max_days_between': gap_max,
+        'repeat': days > 1
+    }
+
+    # months are increasing and distinct, so each offset is counted once
+    counts = cohorts.setdefault(cohort, [])
+    for month in months:
+        offset = month - months[0]
+        if offset >= len(counts):
+            counts.extend([0] * (offset + 1 - len(counts)))
+        counts[offset] += 1
+
+
+def repeat_purchase_summary(customers):
+    """
+    Returns: dictionary with overall repeat-purchase figures
+
+    Expected Output Format:
+    {
+        'customers': 50,
+        'repeat_customers': 18,
+        'repeat_rate': 36.0,           # percent of customers
+        'avg_days_between': 6.42       # over all repeat purchases, None if none
+    }
+    """
+    repeat = 0
+    gaps = 0
+    gap_total = 0
+    for stats in customers.values():
+        if stats['repeat']:
+            repeat += 1
+            gaps += stats['purchase_days'] - 1
+            gap_total += (parse_date(stats['last_purchase']) - parse_date(stats['first_purchase'])).days
+
+    total = len(customers)
+    return {
+        'customers': total,
+        'repeat_customers': repeat,
+        'repeat_rate': round(repeat / total * 100, 2) if total else 0.0,
+        'avg_days_between': round(gap_total / gaps, 2) if gaps else None
+    }
+
+
+def retention_matrix(cohorts):
+    """
+    Converts cohort counts into retention percentages
+
+    Returns: {cohort: [100.0, 58.33, 25.0, ...]} - percent of the cohort
+    active in each month after their first purchase
+    """
+    return {
+        cohort: [round(c / counts[0] * 100, 2) for c in counts]
+        for cohort, counts in cohorts.items()
+    }
+
+
+def format_retention_matrix(cohorts):
+    """
+    Returns: the retention matrix as printable text lines
+    """
+    width = max((len(counts) for counts in cohorts.values()), default=0)
+    lines = [f"{'Cohort':<10}{'Size':>7}" + "".join(f"{'M' + str(i):>8}" for i in range(width))]
+    for cohort, row in retention_matrix(cohorts).items():
+        cells = "".join(f"{value:>7.1f}%" for value in row)
+        lines.append(f"{cohort:<10}{cohorts[cohort][0]:>7}{cells}")
+    return lines
@@ -1,6 +1,15 @@
+from utils.analytics_cache import memoize
+from utils.money import line_amount, from_minor_units
+
+# Every analysis function is memoized per dataset and arguments (see
+# utils/analytics_cache.py), so nested calls such as region_wise_sales ->
+# calculate_total_revenue are computed once. Only fingerprinted Datasets
+# (from read/parse/validate) are cached; callers get their own copy.
+
 # Task 2.1: Sales summery calculator
 
 # (a): Calculate Total Revenue
+@memoize
 def calculate_total_revenue(transactions):
     """
     Calculates total revenue from all transactions
@@ -9,16 +18,20 @@ def calculate_total_revenue(transactions):
 
     Expected Output: Single number representing sum of (Quantity * UnitPrice)
     Example: 1545000.50
+
+    Amounts are summed as integer minor units, so the total is exact to
+    the cent regardless of row count or summation order.
     """
 
-    total = 0.0
+    total = 0
     for t in transactions:
-        total += t['Quantity'] * t['UnitPrice']
-    return round(total, 2)
+        total += line_amount(t)
+    return round(from_minor_units(total), 2)
 
 # (b): Region-wise Sales Analysis
 
 
+@memoize
 def region_wise_sales(transactions):
 
     # Total revenue of all transactions
@@ -27,11 +40,11 @@ def region_wise_sales(transactions):
 
     for t in transactions:
         region = t['Region']
-        revenue = t['Quantity'] * t['UnitPrice']
+        revenue = line_amount(t)
 
         if region not in region_stats:
             region_stats[region] = {
-                'total_sales': 0.0,
+                'total_sales': 0,
                 'transaction_count': 0,
                 'percentage': 0.0
             }
@@ -41,7 +54,7 @@ def region_wise_sales(transactions):
 
     # Calculate percentage and round values
     for region, stats in region_stats.items():
-        stats['total_sales'] = round(stats['total_sales'], 2)
+        stats['total_sales'] = round(from_minor_units(stats['total_sales']), 2)
         stats['percentage'] = round(
             (stats['total_sales'] / total_revenue) * 100, 2) if total_revenue > 0 else 0.0
 
@@ -57,6 +70,7 @@ def region_wise_sales(transactions):
 # (c): Top Selling Products
 
 
+@memoize
 def top_selling_products(transactions, n=5):
     """
     Finds top n products by total quantity sold
@@ -75,12 +89,12 @@ def top_selling_products(transactions, n=5):
     for t in transactions:
         product = t['ProductName']
         quantity = t['Quantity']
-        revenue = t['Quantity'] * t['UnitPrice']
+        revenue = line_amount(t)
 
         if product not in product_stats:
             product_stats[product] = {
                 'total_quantity': 0,
-                'total_revenue': 0.0
+                'total_revenue': 0
             }
 
         product_stats[product]['total_quantity'] += quantity
@@ -92,7 +106,7 @@ def top_selling_products(transactions, n=5):
         result.append((
             product_name,
             stats['total_quantity'],
-            round(stats['total_revenue'], 2)
+            round(from_minor_units(stats['total_revenue']), 2)
         ))
 
     # Sort by quantity (descending)
@@ -104,6 +118,7 @@ def top_selling_products(transactions, n=5):
 # (d): Customer Purchase Analysis
 
 
+@memoize
 def customer_analysis(transactions):
     """
     Analyzes customer purchase patterns.
@@ -118,11 +133,11 @@ def customer_analysis(transactions):
     for t in transactions:
         customer = t["CustomerID"]
         product = t["ProductName"]
-        amount = t["Quantity"] * t["UnitPrice"]
+        amount = line_amount(t)
 
         if customer not in customer_stats:
             customer_stats[customer] = {
-                "total_spent": 0.0,
+                "total_spent": 0,
                 "purchase_count": 0,
                 "products_bought": set()   # set ensures uniqueness
             }
@@ -133,7 +148,7 @@ def customer_analysis(transactions):
 
     # Step 2: Calculate average order value and clean output types
     for customer, stats in customer_stats.items():
-        spent = stats["total_spent"]
+        spent = from_minor_units(stats["total_spent"])
         count = stats["purchase_count"]
 
         if count > 0:
@@ -161,6 +176,7 @@ def customer_analysis(transactions):
 # (a): Daily Sales Trend
 
 
+@memoize
 def daily_sales_trend(transactions):
     """
     Analyzes sales trends by date
@@ -190,12 +206,12 @@ def daily_sales_trend(transactions):
 
     for t in transactions:
         date = t['Date']
-        revenue = t['Quantity'] * t['UnitPrice']
+        revenue = line_amount(t)
         customer = t['CustomerID']
 
         if date not in date_stats:
             date_stats[date] = {
-                'revenue': 0.0,
+                'revenue': 0,
                 'transaction_count': 0,
                 'unique_customers': set()
             }
@@ -206,7 +222,7 @@ def daily_sales_trend(transactions):
 
     # Finalize unique customer counts and round revenue
     for date, stats in date_stats.items():
-        stats['revenue'] = round(stats['revenue'], 2)
+        stats['revenue'] = round(from_minor_units(stats['revenue']), 2)
         stats['unique_customers'] = len(stats['unique_customers'])
 
     # Sort by date
@@ -220,6 +236,7 @@ def daily_sales_trend(transactions):
 # (b): Find Peak Sales Day
 
 
+@memoize
 def find_peak_sales_day(transactions):
     """
     Identifies the date with highest revenue
@@ -249,6 +266,7 @@ def find_peak_sales_day(transactions):
 # Low Performing Products
 
 
+@memoize
 def low_performing_products(transactions, threshold=10):
     """
     Identifies products with low sales
@@ -273,12 +291,12 @@ def low_performing_products(transactions, threshold=10):
     for t in transactions:
         product = t['ProductName']
         quantity = t['Quantity']
-        revenue = t['Quantity'] * t['UnitPrice']
+        revenue = line_amount(t)
 
         if product not in product_stats:
             product_stats[product] = {
                 'total_quantity': 0,
-                'total_revenue': 0.0
+                'total_revenue': 0
             }
 
         product_stats[product]['total_quantity'] += quantity
@@ -291,7 +309,7 @@ def low_performing_products(transactions, threshold=10):
             low_performers.append((
                 product_name,
                 stats['total_quantity'],
-                round(stats['total_revenue'], 2)
+                round(from_minor_units(stats['total_revenue']), 2)
             ))
 
     # Sort by total_quantity ascending
@@ -1,9 +1,44 @@
+import os
+import tempfile
+import threading
+from bisect import bisect_right
+from contextlib import contextmanager
+from datetime import date
+
+from utils.analytics_cache import Dataset, file_fingerprint, derive
+from utils.quarantine import (
+    FIELD_COUNT, BAD_NUMBER, MISSING_FIELD, BAD_TRANSACTION_ID,
+    BAD_PRODUCT_ID, BAD_CUSTOMER_ID, BAD_QUANTITY, BAD_UNIT_PRICE, SUB_CENT_PRICE
+)
+from utils.money import is_whole_minor_units
+
+
+class SourcedRows(Dataset):
+    """
+    A Dataset that knows which input line each row came from, so rejected
+    rows can be reported by file line (see source_of())
+
+    - skipped: for every input line that was left out (blank lines and
+      header for read_sales_data, rejects for parse_transactions), the
+      number of rows kept before it; it is sorted, so lookups bisect it
+    - source: the input rows themselves, when they are needed later
+    - offsets / parts: start index and rows of each file, when several
+      files were concatenated
+    """
+
+    skipped = ()
+    source = None
+    offsets = None
+    parts = None
+
 # Task 1.1: Read sales data with encoding handling
 def read_sales_data(filename):
     """
     Reads sales data from file handling encoding issues
 
     Returns: list of raw lines (strings)
+    The list is a Dataset carrying the file's fingerprint; parse and
+    validate pass it on, so analysis results can be cached per dataset.
 
     Expected Output Format:
     ['T001|2024-12-01|P101|Laptop|2|45000|C001|North', ...]
@@ -21,23 +56,15 @@ def read_sales_data(filename):
 
     for encoding in encodings:
         try:
+            # stat before reading: if the file changes meanwhile, the next
+            # read sees a different fingerprint
+            fingerprint = file_fingerprint(filename)
             with open(filename, 'r', encoding=encoding) as file:
                 lines = file.readlines()
 
-            raw_lines = []
-            for line in lines:
-                line = line.strip()
-
-                # Skip empty lines
-                if not line:
-                    continue
-
-                # skip header
-                if line.lower().startswith('transactionid'):
-                    continue
-
-                raw_lines.append(line)
-
+            skipped = []
+            raw_lines = SourcedRows(clean_lines(lines, skipped), fingerprint)
+            raw_lines.skipped = skipped
             return raw_lines
 
         except UnicodeDecodeError:
@@ -50,20 +77,72 @@ def read_sales_data(filename):
     print("Error: Unable to read file due to encoding issues.")
     return []  # Return empty list if all encodings fail
 
+
+def clean_lines(lines, skipped=None):
+    """
+    Strips lines and drops empty lines and the header row
+
+    Returns: list of raw lines (strings)
+    If a `skipped` list is given, the number of kept lines before each
+    dropped line is appended to it (see SourcedRows).
+    """
+    raw_lines = []
+    for line in lines:
+        line = line.strip()
+
+        # Skip empty lines and the header
+        if not line or line.lower().startswith('transactionid'):
+            if skipped is not None:
+                skipped.append(len(raw_lines))
+            continue
+
+        raw_lines.append(line)
+
+    return raw_lines
+
+
+def decode_lines(data):
+    """
+    Same as read_sales_data(), but for bytes already read from a file
+    (e.g. the appended tail of a growing file)
+
+    Returns: list of raw lines (strings)
+    """
+    for encoding in ['utf-8', 'latin-1', 'cp1252']:
+        try:
+            text = data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+        # universal newlines, like open() in text mode
+        return clean_lines(text.replace('\r\n', '\n').replace('\r', '\n').split('\n'))
+    return []
+
 # Task 1.2: Parse and Clean Data
 
 
-def parse_transactions(raw_lines):
+def parse_transactions(raw_lines, reject_sink=None):
 
    # Parses raw lines into clean list of dictionaries
+   # Rejected lines go to reject_sink (a QuarantineSink) when one is given.
+   # The result is then a SourcedRows remembering raw_lines and the rejects,
+   # so validate_and_filter can quarantine by file line (see source_of)
 
-    transactions = []
+    transactions = derive([], raw_lines, 'parse')
+    rejected = []
+
+    if reject_sink is not None:
+        transactions = SourcedRows(fingerprint=getattr(transactions, 'fingerprint', None))
+        transactions.source = raw_lines
+        transactions.skipped = rejected
 
     for line in raw_lines:
         parts = line.split('|')
 
         # Must have exactly 8 fields
         if len(parts) != 8:
+            if reject_sink is not None:
+                _reject_line(reject_sink, raw_lines, len(transactions) + len(rejected), FIELD_COUNT)
+            rejected.append(len(transactions))
             continue
 
         transaction_id, date, product_id, product_name, quantity, unit_price, customer_id, region = parts
@@ -80,6 +159,9 @@ def parse_transactions(raw_lines):
             quantity = int(quantity)
             unit_price = float(unit_price)
         except ValueError:
+            if reject_sink is not None:
+                _reject_line(reject_sink, raw_lines, len(transactions) + len(rejected), BAD_NUMBER)
+            rejected.append(len(transactions))
             continue
 
         transactions.append({
@@ -95,10 +177,87 @@ def parse_transactions(raw_lines):
 
     return transactions
 
+
+def _input_position(index, skipped):
+    # Position in the input of the index-th kept row: every skipped line
+    # with at most `index` kept rows before it comes ahead of that row
+    return index + bisect_right(skipped, index)
+
+
+def _reject_line(reject_sink, raw_lines, index, reason):
+    line_no = _input_position(index, getattr(raw_lines, 'skipped', ())) + 1
+    reject_sink.reject(line_no, raw_lines[index], reason)
+
+
+def source_of(rows, index):
+    """
+    Finds where rows[index] came from
+
+    Returns: (line_no, raw_line) - the 1-based line in its input file and
+    the line as read. Rows that don't carry their source (parse_transactions
+    only keeps it when given a reject_sink) give (index + 1, None).
+    """
+    if not isinstance(rows, SourcedRows):
+        return index + 1, None
+
+    if rows.parts:
+        # concatenated files: line numbers are per file
+        part = bisect_right(rows.offsets, index) - 1
+        return source_of(rows.parts[part], index - rows.offsets[part])
+
+    raw_lines = rows.source
+    if raw_lines is None:
+        return index + 1, None
+
+    index = _input_position(index, rows.skipped)
+    return _input_position(index, getattr(raw_lines, 'skipped', ())) + 1, raw_lines[index]
+
+# Date helper
+
+_parsed_dates = {}
+
+
+def parse_date(value):
+    """
+    Parses a 'YYYY-MM-DD' string (or passes a date through)
+
+    Returns: datetime.date, or None if the value isn't a valid date
+
+    Dates repeat across transactions, so parsed strings are cached.
+    """
+    if value is None or isinstance(value, date):
+        return value
+
+    if value not in _parsed_dates:
+        try:
+            _parsed_dates[value] = date.fromisoformat(value.strip())
+        except ValueError:
+            _parsed_dates[value] = None
+    return _parsed_dates[value]
+
+
+def parse_date_range(start_date=None, end_date=None):
+    """
+    Parses the bounds of an inclusive date range (None = open)
+
+    Returns: (start, end) as datetime.date or None
+
+    Raises ValueError for a bound that is given but isn't a valid date,
+    rather than silently leaving that side of the range open.
+    """
+    bounds = []
+    for name, value in (('start date', start_date), ('end date', end_date)):
+        parsed = parse_date(value)
+        if value is not None and parsed is None:
+            raise ValueError(f"Invalid {name} {value!r}, expected YYYY-MM-DD")
+        bounds.append(parsed)
+    return tuple(bounds)
+
 # Task 1.3: Data Validation and Filtering
 
 
-def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None):
+def validate_and_filter(transactions, region=None, min_amount=None, max_amount=None, reject_sink=None,
+                        start_date=None, end_date=None):
     """
     Validates and filters transactions based on criteria
 
@@ -106,6 +265,10 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
     - transactions: list of transaction dictionaries
     - region: filter by region (string)
     - min_quantity: filter by minimum quantity (int)
+    - reject_sink: optional QuarantineSink receiving invalid records
+    - start_date / end_date: keep dates in this range, inclusive
+      ('YYYY-MM-DD' or datetime.date). Rows with unparseable dates are
+      dropped when a range is given; an invalid bound raises ValueError.
 
     Returns: filtered list of transactions
     """
@@ -115,39 +278,51 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
         'Quantity', 'UnitPrice', 'CustomerID', 'Region'
     ]
 
+    start, end = parse_date_range(start_date, end_date)
+
+    # Identifies the result for the analysis cache (see utils/analytics_cache.py)
+    step = ('validate', region.lower() if region else None, min_amount, max_amount, start, end)
+
     total_input = len(transactions)
     invalid_count = 0
-    valid_transactions = []
+    valid_transactions = derive([], transactions, *step)
 
     # validation
 
     for t in transactions:
         # required fields exist
         if not all(key in t for key in required_keys):
-            invalid_count += 1
-            continue
+            reason = MISSING_FIELD
 
         # valid prefixes
-        if not str(t["TransactionID"]).startswith('T'):
-            invalid_count += 1
-            continue
-        if not str(t["ProductID"]).startswith('P'):
-            invalid_count += 1
-            continue
-        if not str(t["CustomerID"]).startswith('C'):
-            invalid_count += 1
-            continue
+        elif not str(t["TransactionID"]).startswith('T'):
+            reason = BAD_TRANSACTION_ID
+        elif not str(t["ProductID"]).startswith('P'):
+            reason = BAD_PRODUCT_ID
+        elif not str(t["CustomerID"]).startswith('C'):
+            reason = BAD_CUSTOMER_ID
 
         # valid values
-        if t["Quantity"] <= 0:
-            invalid_count += 1
-            continue
-        if t["UnitPrice"] <= 0:
-            invalid_count += 1
+        elif t["Quantity"] <= 0:
+            reason = BAD_QUANTITY
+        elif t["UnitPrice"] <= 0:
+            reason = BAD_UNIT_PRICE
+        elif not is_whole_minor_units(t["UnitPrice"]):
+            reason = SUB_CENT_PRICE
+
+        else:
+            # if all checks passed
+            valid_transactions.append(t)
             continue
 
-        # if all checks passed
-        valid_transactions.append(t)
+        if reject_sink is not None:
+            # position of t in the input, without counting every row
+            line_no, raw_line = source_of(transactions, len(valid_transactions) + invalid_count)
+            if raw_line is None:
+                reject_sink.reject_record(line_no, t, reason)
+            else:
+                reject_sink.reject(line_no, raw_line, reason)
+        invalid_count += 1
 
     # filtering
 
@@ -155,6 +330,7 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
 
     filtered_by_region = 0
     filtered_by_amount = 0
+    filtered_by_date = 0
 
     # filter by region
     if region:
@@ -176,12 +352,92 @@ def validate_and_filter(transactions, region=None, min_amount=None, max_amount=N
                     * t['UnitPrice'] <= max_amount]
         filtered_by_amount += before - len(filtered)
 
+    # filter by date range
+    if start is not None or end is not None:
+        start = start or date.min
+        end = end or date.max
+
+        def in_range(t):
+            d = parse_date(t['Date'])
+            return d is not None and start <= d <= end
+
+        before = len(filtered)
+        filtered = [t for t in filtered if in_range(t)]
+        filtered_by_date += before - len(filtered)
+
     filter_summary = {
         'total_input': total_input,
         'invalid_count': invalid_count,
         'filtered_by_region': filtered_by_region,
         'filtered_by_amount': filtered_by_amount,
+        'filtered_by_date': filtered_by_date,
         'total_output': len(filtered)
     }
 
+    if filtered is not valid_transactions:
+        filtered = derive(filtered, transactions, *step)
+
     return filtered, invalid_count, filter_summary
+
+# Atomic output files
+
+_umask_lock = threading.Lock()
+
+
+def _umask():
+    # The process umask. Linux shows it in /proc; elsewhere os.umask() can
+    # only read it by setting it, so set a strict value for that moment
+    try:
+        with open('/proc/self/status', encoding='ascii') as status:
+            for line in status:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    with _umask_lock:
+        mask = os.umask(0o077)
+        os.umask(mask)
+    return mask
+
+
+@contextmanager
+def atomic_write(filename, mode='w', encoding='utf-8', buffering=-1):
+    """
+    Opens a temporary file next to `filename` and renames it over
+    `filename` once the block finishes
+
+    Readers see either the old file or the complete new one, never a
+    partly written file. If the block raises, the temporary file is
+    removed and `filename` is left untouched. A replaced file keeps its
+    permissions; a new one gets the usual 0666 minus the umask.
+
+    Usage:
+        with atomic_write('output/sales_report.txt') as f:
+            f.write(...)
+    """
+    folder = os.path.dirname(filename) or '.'
+    fd, temp_path = tempfile.mkstemp(
+        dir=folder, prefix='.' + os.path.basename(filename) + '.', suffix='.tmp')
+
+    try:
+        if 'b' in mode:
+            file = os.fdopen(fd, mode, buffering)
+        else:
+            file = os.fdopen(fd, mode, buffering, encoding=encoding)
+        with file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp creates the file as 0600
+        try:
+            permissions = os.stat(filename).st_mode & 0o7777
+        except FileNotFoundError:
+            permissions = 0o666 & ~_umask()
+        os.chmod(temp_path, permissions)
+        os.replace(temp_path, filename)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
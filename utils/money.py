@@ -0,0 +1,125 @@
+# utils/money.py
+
+# Revenue is accumulated as integer minor units (cents). Integer addition is
+# exact and order independent, so sequential, sharded and vectorized paths
+# all produce the same totals to the cent.
+MINOR_UNITS = 100
+
+
+# Prices repeat a lot across transactions, so conversions are cached in a
+# plain dict (cheaper per row than functools.lru_cache). It is reset when it
+# grows past _CACHE_LIMIT distinct prices.
+_CACHE_LIMIT = 65536
+_minor_cache = {}
+_whole_cache = {}
+
+
+def to_minor_units(price):
+    """
+    Converts a price to integer minor units
+
+    Example: 1916.0 -> 191600, 99.99 -> 9999
+    """
+    minor = _minor_cache.get(price)
+    if minor is None:
+        if len(_minor_cache) >= _CACHE_LIMIT:
+            _minor_cache.clear()
+        minor = _minor_cache[price] = int(round(price * MINOR_UNITS))
+    return minor
+
+
+def is_whole_minor_units(price):
+    """
+    Returns: True if the price is a whole number of minor units
+
+    Example: 99.99 -> True, 0.125 -> False
+    to_minor_units() rounds 0.125 to 12 cents, so Quantity 1000 x 0.125
+    would total 120.0 instead of 125.0; validation rejects such prices
+    rather than totalling them inexactly.
+    """
+    whole = _whole_cache.get(price)
+    if whole is None:
+        if len(_whole_cache) >= _CACHE_LIMIT:
+            _whole_cache.clear()
+        scaled = price * MINOR_UNITS
+        # allow for binary float error (99.99 * 100 == 9999.000000000002)
+        whole = _whole_cache[price] = abs(scaled - round(scaled)) < 1e-6
+    return whole
+
+
+def from_minor_units(minor):
+    """
+    Converts integer minor units back to a float amount
+
+    Example: 191600 -> 1916.0
+    """
+    return minor / MINOR_UNITS
+
+
+def line_amount(t):
+    """
+    Returns: Quantity * UnitPrice of a transaction in minor units (int)
+    """
+    minor = _minor_cache.get(t['UnitPrice'])
+    if minor is None:
+        minor = to_minor_units(t['UnitPrice'])
+    return t['Quantity'] * minor
+
+
+def benchmark(rows=1_000_000, seed=42):
+    """
+    Compares revenue accumulation strategies on synthetic transactions
+
+    Returns: dictionary {strategy: (seconds, total)}
+
+    Run with: python -m utils.money
+    """
+    import math
+    import random
+    import time
+    from decimal import Decimal
+
+    rng = random.Random(seed)
+    prices = [rng.randint(100, 5_000_000) / 100 for _ in range(500)]
+    transactions = [
+        {'Quantity': rng.randint(1, 10), 'UnitPrice': rng.choice(prices)}
+        for _ in range(rows)
+    ]
+
+    def float_sum():
+        total = 0.0
+        for t in transactions:
+            total += t['Quantity'] * t['UnitPrice']
+        return round(total, 2)
+
+    def minor_units_sum():
+        total = 0
+        for t in transactions:
+            total += line_amount(t)
+        return from_minor_units(total)
+
+    def fsum():
+        return round(math.fsum(t['Quantity'] * t['UnitPrice'] for t in transactions), 2)
+
+    def decimal_sum():
+        total = Decimal(0)
+        for t in transactions:
+            total += t['Quantity'] * Decimal(str(t['UnitPrice']))
+        return float(total)
+
+    results = {}
+    for name, func in [('float', float_sum), ('minor_units', minor_units_sum),
+                       ('fsum', fsum), ('decimal', decimal_sum)]:
+        start = time.perf_counter()
+        total = func()
+        results[name] = (time.perf_counter() - start, total)
+
+    return results
+
+
+if __name__ == "__main__":
+    results = benchmark()
+    baseline = results['float'][0]
+    print(f"{'Strategy':<14}{'Seconds':<10}{'vs float':<10}{'Total'}")
+    for name, (seconds, total) in results.items():
+        print(f"{name:<14}{seconds:<10.3f}{seconds / baseline:<10.2f}{total:,.2f}")
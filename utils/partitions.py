@@ -0,0 +1,148 @@
+# utils/partitions.py
+
+import json
+import os
+from datetime import timedelta
+
+from utils.file_handler import atomic_write, parse_date, parse_date_range
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Partition that holds transactions whose Date can't be parsed
+UNDATED = "undated"
+
+HEADER = "TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region\n"
+
+
+def partition_key(date_str, granularity="day"):
+    """
+    Returns the partition a date belongs to
+
+    Example: '2024-12-05' -> '2024-12-05' (day) or '2024-12' (month)
+    """
+    d = parse_date(date_str)
+    if d is None:
+        return UNDATED
+    return d.isoformat() if granularity == "day" else d.isoformat()[:7]
+
+
+def load_manifest(root="data/partitions"):
+    """
+    Returns: manifest dictionary, or an empty manifest if none exists yet
+
+    Manifest Format:
+    {
+        'version': 1,
+        'granularity': 'day',
+        'partitions': {
+            '2024-12-01': {'file': '2024-12-01.txt', 'min_date': '2024-12-01',
+                           'max_date': '2024-12-01', 'rows': 3},
+            ...
+        }
+    }
+    """
+    try:
+        with open(os.path.join(root, MANIFEST_NAME), 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {'version': MANIFEST_VERSION, 'granularity': None, 'partitions': {}}
+
+
+def write_partitions(transactions, root="data/partitions", granularity="day"):
+    """
+    Writes validated transactions into per-day or per-month partition files
+
+    - granularity: 'day' or 'month'
+    - Partitions present in transactions are rewritten; other partitions
+      already on disk are kept, so daily ingestion only touches new days.
+
+    Returns: the updated manifest
+    """
+    if granularity not in ("day", "month"):
+        raise ValueError("granularity must be 'day' or 'month'")
+
+    manifest = load_manifest(root)
+    if manifest['partitions'] and manifest['granularity'] != granularity:
+        raise ValueError(
+            f"{root} is partitioned by {manifest['granularity']}, not {granularity}")
+    manifest['granularity'] = granularity
+
+    groups = {}
+    for t in transactions:
+        groups.setdefault(partition_key(t['Date'], granularity), []).append(t)
+
+    os.makedirs(root, exist_ok=True)
+
+    for key, rows in groups.items():
+        filename = f"{key}.txt"
+        with atomic_write(os.path.join(root, filename)) as file:
+            file.write(HEADER)
+            for t in rows:
+                file.write("|".join([
+                    t['TransactionID'], t['Date'], t['ProductID'], t['ProductName'],
+                    str(t['Quantity']), str(t['UnitPrice']), t['CustomerID'], t['Region']
+                ]) + "\n")
+
+        dates = [t['Date'] for t in rows if parse_date(t['Date']) is not None]
+        manifest['partitions'][key] = {
+            'file': filename,
+            'min_date': min(dates) if dates else None,
+            'max_date': max(dates) if dates else None,
+            'rows': len(rows)
+        }
+
+    # written last: readers never see partitions listed before they're complete
+    with atomic_write(os.path.join(root, MANIFEST_NAME)) as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+
+    return manifest
+
+
+def select_partitions(manifest, start_date=None, end_date=None):
+    """
+    Partition pruning: picks only partitions that overlap the date range
+
+    Returns: list of partition file names, in date order
+    Undated rows are only included when no range is given.
+    """
+    start, end = parse_date_range(start_date, end_date)
+    selected = []
+
+    for key, info in sorted(manifest['partitions'].items()):
+        if info['min_date'] is None:
+            if start is None and end is None:
+                selected.append(info['file'])
+            continue
+        if start is not None and parse_date(info['max_date']) < start:
+            continue
+        if end is not None and parse_date(info['min_date']) > end:
+            continue
+        selected.append(info['file'])
+
+    return selected
+
+
+def last_days_range(manifest, days):
+    """
+    Returns: (start_date, end_date) covering the last `days` days of data
+
+    Raises ValueError if days isn't a positive number of days.
+    """
+    if days <= 0:
+        raise ValueError(f"days must be positive, got {days}")
+    max_dates = [parse_date(info['max_date']) for info in manifest['partitions'].values()
+                 if info['max_date'] is not None]
+    if not max_dates:
+        return None, None
+
+    end = max(max_dates)
+    return end - timedelta(days=days - 1), end
+
+
+def partition_files(root="data/partitions", start_date=None, end_date=None):
+    """
+    Returns: paths of the partition files needed for the date range
+    """
+    manifest = load_manifest(root)
+    return [os.path.join(root, f) for f in select_partitions(manifest, start_date, end_date)]
@@ -0,0 +1,221 @@
+# utils/perf_gate.py
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from utils.file_handler import read_sales_data, parse_transactions, validate_and_filter
+from utils.data_processor import (
+    calculate_total_revenue,
+    region_wise_sales,
+    top_selling_products,
+    customer_analysis,
+    daily_sales_trend,
+    find_peak_sales_day,
+    low_performing_products
+)
+from utils.analytics_cache import clear_analytics_cache
+from utils.api_handler import enrich_sales_data
+from utils.report_generator import generate_sales_report
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perf_baselines.json")
+
+# A stage fails when it gets this much slower / more memory-hungry
+THROUGHPUT_TOLERANCE = 0.30
+MEMORY_TOLERANCE = 0.20
+# Growth below this many KiB is noise for stages that barely allocate
+MEMORY_SLACK_KIB = 64
+
+WORKLOAD_ROWS = 50_000
+WORKLOAD_SEED = 2024
+
+PRODUCTS = ['Laptop', 'Mouse', 'Keyboard', 'Monitor', 'Webcam', 'Headphones',
+            'USB Cable', 'External Hard Drive', 'Laptop Charger', 'Wireless Mouse']
+REGIONS = ['North', 'South', 'East', 'West']
+
+
+def synthetic_lines(rows=WORKLOAD_ROWS, seed=WORKLOAD_SEED):
+    """
+    Fixed-seed synthetic sales file content (header + rows)
+
+    About 5% of rows are invalid (zero quantity, bad ids) and some prices
+    use thousands separators, like the real data.
+    """
+    rng = random.Random(seed)
+    lines = ["TransactionID|Date|ProductID|ProductName|Quantity|UnitPrice|CustomerID|Region"]
+    for i in range(rows):
+        product = rng.randrange(len(PRODUCTS))
+        quantity = rng.randint(1, 10) if rng.random() > 0.03 else 0
+        price = rng.randint(100, 60000)
+        price_text = f"{price:,}" if rng.random() < 0.2 else str(price)
+        prefix = 'T' if rng.random() > 0.02 else 'X'
+        lines.append(
+            f"{prefix}{i:06d}|2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}|"
+            f"P{101 + product}|{PRODUCTS[product]}|{quantity}|{price_text}|"
+            f"C{rng.randint(1, 5000):04d}|{rng.choice(REGIONS)}")
+    return lines
+
+
+def _stages(filename, output_file):
+    """
+    Returns: list of (stage name, function) running the public pipeline
+
+    Each stage reads the previous stage's result from `state`.
+    """
+    state = {}
+
+    def run(name, func):
+        def stage():
+            state[name] = func()
+        return name, stage
+
+    return [
+        run('read_sales_data', lambda: read_sales_data(filename)),
+        run('parse_transactions', lambda: parse_transactions(state['read_sales_data'])),
+        run('validate_and_filter', lambda: validate_and_filter(state['parse_transactions'])[0]),
+        run('calculate_total_revenue', lambda: calculate_total_revenue(state['validate_and_filter'])),
+        run('region_wise_sales', lambda: region_wise_sales(state['validate_and_filter'])),
+        run('top_selling_products', lambda: top_selling_products(state['validate_and_filter'])),
+        run('customer_analysis', lambda: customer_analysis(state['validate_and_filter'])),
+        run('daily_sales_trend', lambda: daily_sales_trend(state['validate_and_filter'])),
+        run('find_peak_sales_day', lambda: find_peak_sales_day(state['validate_and_filter'])),
+        run('low_performing_products', lambda: low_performing_products(state['validate_and_filter'])),
+        run('enrich_sales_data', lambda: enrich_sales_data(state['validate_and_filter'], {})),
+        run('generate_sales_report', lambda: generate_sales_report(
+            state['validate_and_filter'], state['enrich_sales_data'], output_file)),
+    ]
+
+
+def measure(rows=WORKLOAD_ROWS, seed=WORKLOAD_SEED, repeats=3):
+    """
+    Runs the workload through every stage
+
+    Returns: {stage: {'rows_per_sec': float, 'peak_kib': float}}
+
+    Throughput is the best of `repeats` runs without tracing; peak memory
+    comes from one extra run under tracemalloc. The analysis cache is
+    cleared before every stage, so each one is measured cold.
+    """
+    results = {}
+
+    with tempfile.TemporaryDirectory() as folder:
+        filename = os.path.join(folder, "sales_data.txt")
+        with open(filename, 'w', encoding='utf-8') as file:
+            file.write("\n".join(synthetic_lines(rows, seed)) + "\n")
+        output_file = os.path.join(folder, "output", "sales_report.txt")
+
+        timings = {}
+        for _ in range(repeats):
+            for name, stage in _stages(filename, output_file):
+                clear_analytics_cache()
+                start = time.perf_counter()
+                stage()
+                elapsed = time.perf_counter() - start
+                timings[name] = min(timings.get(name, elapsed), elapsed)
+
+        for name, stage in _stages(filename, output_file):
+            clear_analytics_cache()
+            tracemalloc.start()
+            stage()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results[name] = {
+                'rows_per_sec': round(rows / timings[name], 1) if timings[name] else 0.0,
+                'peak_kib': round(peak / 1024, 1)
+            }
+
+    return results
+
+
+def load_baselines(filename=BASELINE_FILE):
+    try:
+        with open(filename, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def save_baselines(results, rows=WORKLOAD_ROWS, seed=WORKLOAD_SEED, filename=BASELINE_FILE):
+    with open(filename, 'w', encoding='utf-8') as file:
+        json.dump({'rows': rows, 'seed': seed, 'stages': results}, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def compare(results, baselines, throughput_tolerance=THROUGHPUT_TOLERANCE,
+            memory_tolerance=MEMORY_TOLERANCE):
+    """
+    Compares measured results against stored baselines
+
+    Returns: (list of failed stages, diff table as a string)
+    """
+    header = (f"{'Stage':<26}{'rows/s base':>13}{'rows/s now':>13}{'diff':>8}"
+              f"{'peak KiB base':>15}{'peak KiB now':>14}{'diff':>8}  Status")
+    lines = [header, "-" * len(header)]
+    failed = []
+
+    for name, now in results.items():
+        base = baselines['stages'].get(name)
+        if base is None:
+            lines.append(f"{name:<26}{'-':>13}{now['rows_per_sec']:>13,.0f}{'':>8}"
+                         f"{'-':>15}{now['peak_kib']:>14,.1f}{'':>8}  NEW")
+            continue
+
+        speed = (now['rows_per_sec'] / base['rows_per_sec'] - 1) if base['rows_per_sec'] else 0.0
+        memory = (now['peak_kib'] / base['peak_kib'] - 1) if base['peak_kib'] else 0.0
+
+        problems = []
+        if speed < -throughput_tolerance:
+            problems.append("SLOWER")
+        if now['peak_kib'] - base['peak_kib'] > max(base['peak_kib'] * memory_tolerance, MEMORY_SLACK_KIB):
+            problems.append("MEMORY")
+        if problems:
+            failed.append(name)
+
+        lines.append(
+            f"{name:<26}{base['rows_per_sec']:>13,.0f}{now['rows_per_sec']:>13,.0f}{speed:>+8.0%}"
+            f"{base['peak_kib']:>15,.1f}{now['peak_kib']:>14,.1f}{memory:>+8.0%}  "
+            f"{' '.join(problems) or 'ok'}")
+
+    return failed, "\n".join(lines)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Performance regression gate")
+    parser.add_argument("--update", action="store_true",
+                        help="store the measured results as the new baselines")
+    parser.add_argument("--throughput-tolerance", type=float, default=THROUGHPUT_TOLERANCE)
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    baselines = load_baselines()
+    rows = baselines['rows'] if baselines else WORKLOAD_ROWS
+    seed = baselines['seed'] if baselines else WORKLOAD_SEED
+
+    print(f"Running {rows} synthetic rows (seed {seed})...")
+    results = measure(rows, seed)
+
+    if args.update or baselines is None:
+        save_baselines(results, rows, seed)
+        print(f"Baselines saved to: {BASELINE_FILE}")
+        return 0
+
+    failed, table = compare(results, baselines,
+                            args.throughput_tolerance, args.memory_tolerance)
+    print(table)
+
+    if failed:
+        print(f"\nPerformance regression in: {', '.join(failed)}")
+        return 1
+
+    print("\nAll stages within tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+# utils/quarantine.py
+
+import os
+import queue
+import threading
+from collections import Counter
+
+# Reason codes written to the quarantine file
+FIELD_COUNT = 'field_count'          # line doesn't have exactly 8 fields
+BAD_NUMBER = 'bad_number'            # Quantity / UnitPrice don't convert
+MISSING_FIELD = 'missing_field'      # required key missing from the record
+BAD_TRANSACTION_ID = 'bad_transaction_id'
+BAD_PRODUCT_ID = 'bad_product_id'
+BAD_CUSTOMER_ID = 'bad_customer_id'
+BAD_QUANTITY = 'bad_quantity'        # Quantity <= 0
+BAD_UNIT_PRICE = 'bad_unit_price'    # UnitPrice <= 0
+SUB_CENT_PRICE = 'sub_cent_price'    # UnitPrice has a fraction of a cent
+
+FIELD_ORDER = [
+    'TransactionID', 'Date', 'ProductID', 'ProductName',
+    'Quantity', 'UnitPrice', 'CustomerID', 'Region'
+]
+
+
+class QuarantineSink:
+    """
+    Collects rejected rows and writes them to a quarantine file
+
+    File Format:
+    LineNo|Reason|RawLine
+    3|bad_quantity|T075|2024-12-10|P106|Headphones|0|2826|C001|South
+
+    Rejects are buffered in memory and handed to a background writer
+    thread in batches of batch_size, so parsing never waits on disk.
+    Valid rows never touch the sink; pass reject_sink=None (the default)
+    to parse_transactions / validate_and_filter to turn it off entirely.
+
+    Use as a context manager, or call close() to flush the last batch.
+    """
+
+    def __init__(self, filename="output/quarantine.txt", batch_size=1000):
+        self.filename = filename
+        self.batch_size = batch_size
+        self.counts = Counter()
+        self._batch = []
+        self._queue = queue.Queue()
+
+        folder = os.path.dirname(filename)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        self._file = open(filename, 'w', encoding='utf-8')
+        self._file.write("LineNo|Reason|RawLine\n")
+
+        self._writer = threading.Thread(target=self._write_batches, daemon=True)
+        self._writer.start()
+
+    def reject(self, line_no, raw_line, reason):
+        """
+        Records one rejected row
+
+        - line_no: line of the row in its input file (1-based)
+        - raw_line: the row as read, or rebuilt from its fields when the
+          transactions don't carry their source
+        - reason: one of the reason codes above
+        """
+        self.counts[reason] += 1
+        self._batch.append(f"{line_no}|{reason}|{raw_line}\n")
+        if len(self._batch) >= self.batch_size:
+            self._queue.put(self._batch)
+            self._batch = []
+
+    def reject_record(self, line_no, record, reason):
+        # Rebuild a pipe-delimited line from a parsed transaction
+        raw_line = "|".join(str(record.get(key, "")) for key in FIELD_ORDER)
+        self.reject(line_no, raw_line, reason)
+
+    def _write_batches(self):
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                break
+            self._file.writelines(batch)
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self._batch:
+            self._queue.put(self._batch)
+            self._batch = []
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+
+    def summary(self):
+        """
+        Returns: dictionary of reject counts per reason code
+
+        Expected Output Format:
+        {'bad_quantity': 2, 'bad_transaction_id': 1, ...}
+        """
+        return dict(self.counts)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def benchmark(rows=500_000, reject_rate=0.01, seed=7):
+    """
+    Times parse_transactions + validate_and_filter with the sink off and on
+
+    Returns: dictionary {'off': seconds, 'on': seconds}
+
+    Run with: python -m utils.quarantine
+    """
+    import random
+    import tempfile
+    import time
+
+    from utils.file_handler import parse_transactions, validate_and_filter
+
+    rng = random.Random(seed)
+    raw_lines = []
+    for i in range(rows):
+        quantity = rng.randint(1, 10)
+        if rng.random() < reject_rate:
+            quantity = 0
+        raw_lines.append(
+            f"T{i}|2024-12-{rng.randint(1, 30):02d}|P{rng.randint(101, 110)}|Mouse|"
+            f"{quantity}|{rng.randint(100, 50000)}|C{rng.randint(1, 999):03d}|North")
+
+    def run(reject_sink):
+        start = time.perf_counter()
+        validate_and_filter(parse_transactions(raw_lines, reject_sink=reject_sink),
+                            reject_sink=reject_sink)
+        return time.perf_counter() - start
+
+    results = {'off': min(run(None) for _ in range(3))}
+    with tempfile.TemporaryDirectory() as folder:
+        times = []
+        for _ in range(3):
+            with QuarantineSink(os.path.join(folder, "quarantine.txt")) as sink:
+                times.append(run(sink))
+        results['on'] = min(times)
+
+    return results
+
+
+if __name__ == "__main__":
+    results = benchmark()
+    print(f"sink off: {results['off']:.3f} s")
+    print(f"sink on:  {results['on']:.3f} s ({results['on'] / results['off']:.2f}x)")
@@ -1,7 +1,38 @@
 # utils/report_generator.py
 
+import heapq
 import os
+import tempfile
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+
+from utils.file_handler import atomic_write
+from utils.money import to_minor_units, from_minor_units
+
+# Report is written through a large buffer so sections can be streamed
+# row by row without a syscall per line
+REPORT_BUFFER_SIZE = 1024 * 1024
+
+SEPARATOR = "--------------------------------------------------\n"
+BANNER = "== == == == == == == == == == == == == == == == == == == == == == == == ==\n"
+
+
+def safe_float(x):
+    try:
+        return float(x)
+    except Exception:
+        return 0.0
+
+
+def money(x):
+    # Format like: 3,540,205.00
+    return f"{safe_float(x):,.2f}"
+
+
+def amount(t):
+    # Quantity * UnitPrice in integer minor units (cents)
+    return round(safe_float(t.get("Quantity", 0)) * to_minor_units(safe_float(t.get("UnitPrice", 0))))
 
 
 def generate_sales_report(transactions, enriched_transactions, output_file="output/sales_report.txt"):
@@ -18,212 +49,505 @@ def generate_sales_report(transactions, enriched_transactions, output_file="outp
     6. DAILY SALES TREND
     7. PRODUCT PERFORMANCE ANALYSIS
     8. API ENRICHMENT SUMMARY
+
+    Each section is written as soon as its data is final. Per-product,
+    per-customer, per-date and failed-product aggregates are SpillingGroups
+    and sorted runs. Beyond REPORT_GROUP_LIMIT keys they spill to temporary
+    files, so report-time memory does not grow with the number of dates,
+    products or customers. Only per-region totals are kept in a plain dictionary.
     """
 
-    def safe_float(x):
-        try:
-            return float(x)
-        except Exception:
-            return 0.0
+    # Make sure output folder exists
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
-    def money(x):
-        # Format like: 3,540,205.00
-        return f"{safe_float(x):,.2f}"
+    # One pass for the summary, region, product and customer totals
+    records = len(transactions)
+    total_revenue = 0
+    date_min = date_max = None
+    region_stats = {}
+    product_stats = SpillingGroups(_start_product, _add_product, _combine_product)
+    customer_stats = SpillingGroups(_start_customer, _add_customer, _combine_customer)
+
+    try:
+        for i, t in enumerate(transactions):
+            rev = amount(t)
+            total_revenue += rev
+
+            d = t.get("Date")
+            if d:
+                if date_min is None or d < date_min:
+                    date_min = d
+                if date_max is None or d > date_max:
+                    date_max = d
+
+            r = t.get("Region", "").strip()
+            if r not in region_stats:
+                region_stats[r] = {"total_sales": 0, "transaction_count": 0}
+            region_stats[r]["total_sales"] += rev
+            region_stats[r]["transaction_count"] += 1
+
+            product_stats.add(t.get("ProductName", "").strip(),
+                              (i, int(safe_float(t.get("Quantity", 0))), rev))
+            customer_stats.add(t.get("CustomerID", "").strip(), (i, rev))
+
+        # Add percentage + sort
+        region_list = []
+        for r, stats in region_stats.items():
+            pct = (stats["total_sales"] / total_revenue *
+                   100) if total_revenue else 0.0
+            region_list.append(
+                (r, from_minor_units(stats["total_sales"]), pct, stats["transaction_count"]))
+        region_list.sort(key=lambda x: x[1], reverse=True)
+
+        # Top 5 products (by quantity sold) and customers (by total spent);
+        # ties go to the one seen first, like sorting a dict in insertion order
+        top_products = [
+            (p, qty, from_minor_units(rev))
+            for p, (first, qty, rev) in heapq.nlargest(
+                5, product_stats.items(), key=lambda x: (x[1][1], -x[1][0]))
+        ]
+        top_customers = [
+            (c, from_minor_units(spent), orders)
+            for c, (first, spent, orders) in heapq.nlargest(
+                5, customer_stats.items(), key=lambda x: (x[1][1], -x[1][0]))
+        ]
+        customer_stats.close()
+
+        # Avg transaction value per region
+        avg_region = [(r, (sales / txns) if txns else 0.0)
+                      for r, sales, pct, txns in region_list]
+
+        with atomic_write(output_file, buffering=REPORT_BUFFER_SIZE) as f:
+            write_header(f, records)
+            write_overall_summary(f, from_minor_units(total_revenue), records,
+                                  date_min or "N/A", date_max or "N/A")
+            write_region_performance(f, region_list)
+            write_top_products(f, top_products)
+            write_top_customers(f, top_customers)
+
+            peak_day = write_daily_trend(f, iter_daily_trend(transactions))
+
+            write_product_performance(
+                f, peak_day, iter_low_performers(product_stats.items(), threshold=10), avg_region)
+
+            write_enrichment_summary(f, enriched_transactions)
+    finally:
+        product_stats.close()
+        customer_stats.close()
+
+
+def generate_report_from_snapshot(snapshot, output_file="output/sales_report.txt", top_n=5, low_threshold=10):
+    """
+    Rebuilds the sales report from an analytics snapshot
 
-    def amount(t):
-        return safe_float(t.get("Quantity", 0)) * safe_float(t.get("UnitPrice", 0))
+    Same layout as generate_sales_report(), but no transactions are read:
+    everything comes from the aggregates stored by utils.snapshot.
+    top_n and low_threshold can differ from the values of the original run.
+    """
+    from utils.snapshot import (
+        snapshot_top_products, snapshot_top_customers, snapshot_low_performers
+    )
 
-    # Make sure output folder exists
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
-    records = len(transactions)
-    total_revenue = sum(amount(t) for t in transactions)
-    total_transactions = records
+    total_revenue = snapshot['total_revenue']
+    records = snapshot['records']
+    dates = [d[0] for d in snapshot['daily']]
+
+    region_list = [
+        (r, from_minor_units(sales),
+         (sales / total_revenue * 100) if total_revenue else 0.0, txns)
+        for r, sales, txns in snapshot['regions']
+    ]
+    avg_region = [(r, (sales / txns) if txns else 0.0)
+                  for r, sales, pct, txns in region_list]
+
+    top_products = [(p, qty, from_minor_units(rev))
+                    for p, qty, rev in snapshot_top_products(snapshot, top_n)]
+    top_customers = [(c, from_minor_units(spent), orders)
+                     for c, spent, orders in snapshot_top_customers(snapshot, top_n)]
+    low_perf = ((p, qty, from_minor_units(rev))
+                for p, qty, rev in snapshot_low_performers(snapshot, low_threshold))
+    daily = ((d, from_minor_units(rev), txns, uniq)
+             for d, rev, txns, uniq in snapshot['daily'])
+
+    enrichment = snapshot['enrichment']
+
+    with atomic_write(output_file, buffering=REPORT_BUFFER_SIZE) as f:
+        write_header(f, records)
+        write_overall_summary(f, from_minor_units(total_revenue), records,
+                              dates[0] if dates else "N/A", dates[-1] if dates else "N/A")
+        write_region_performance(f, region_list)
+        write_top_products(f, top_products, n=top_n)
+        write_top_customers(f, top_customers, n=top_n)
+
+        peak_day = write_daily_trend(f, daily)
+
+        write_product_performance(
+            f, peak_day, low_perf, avg_region, threshold=low_threshold)
+
+        write_enrichment_counts(
+            f, enrichment['enriched'], enrichment['total'], enrichment['failed_products'])
+
+
+# Streaming helpers
+
+# Most keys a SpillingGroups keeps in memory, and most items iter_sorted()
+# sorts in memory, before spilling a sorted run to a temporary file
+REPORT_GROUP_LIMIT = 100_000
+
+# Runs are merged into one once this many are open (keeps file handles
+# and merge fan-in bounded)
+MAX_OPEN_RUNS = 64
+
+
+def _spill_run(items):
+    # Length-prefixed pickles: a run is read back one item at a time.
+    # pickle is only needed once a report spills, so it isn't imported
+    # at startup
+    import pickle
+
+    run = tempfile.TemporaryFile()
+    for item in items:
+        data = pickle.dumps(item, pickle.HIGHEST_PROTOCOL)
+        run.write(len(data).to_bytes(4, 'little'))
+        run.write(data)
+    return run
+
+
+def _read_run(run):
+    import pickle
+
+    run.seek(0)
+    while True:
+        size = run.read(4)
+        if not size:
+            return
+        yield pickle.loads(run.read(int.from_bytes(size, 'little')))
+
+
+class SpillingGroups:
+    """
+    Per-key aggregates with bounded memory
+
+    - start(value) creates the aggregate for a new key
+    - add(aggregate, value) folds one more value into it (in place); it
+      may return how many extra items the aggregate now holds (e.g. a new
+      set member), None counts as 0
+    - combine(aggregate, other) merges two partial aggregates of one key
+
+    Every key counts as one item. Once `limit` items are held, the
+    aggregates are written to a temporary file as a run sorted by key.
+    items() merges the runs lazily and can be called more than once.
+    """
+
+    def __init__(self, start, add, combine, limit=None):
+        self.start = start
+        self.add_value = add
+        self.combine = combine
+        self.limit = limit or REPORT_GROUP_LIMIT
+        self.groups = {}
+        self.runs = []
+        self.size = 0
+
+    def add(self, key, value):
+        groups = self.groups
+        if key in groups:
+            self.size += self.add_value(groups[key], value) or 0
+        else:
+            groups[key] = self.start(value)
+            self.size += 1
+        if self.size >= self.limit:
+            self._spill()
+
+    def _spill(self):
+        self.runs.append(_spill_run(sorted(self.groups.items(), key=itemgetter(0))))
+        self.groups = {}
+        self.size = 0
+
+        if len(self.runs) >= MAX_OPEN_RUNS:
+            merged = _spill_run(self._merge_runs())
+            for run in self.runs:
+                run.close()
+            self.runs = [merged]
+
+    def items(self):
+        """
+        Yields (key, aggregate) in key order
+        """
+        if not self.runs:
+            yield from sorted(self.groups.items(), key=itemgetter(0))
+            return
+
+        if self.groups:
+            self._spill()
+        yield from self._merge_runs()
+
+    def _merge_runs(self):
+        merged = heapq.merge(*(_read_run(run) for run in self.runs), key=itemgetter(0))
+        for key, parts in groupby(merged, key=itemgetter(0)):
+            aggregate = None
+            for _, part in parts:
+                if aggregate is None:
+                    aggregate = part
+                else:
+                    self.combine(aggregate, part)
+            yield key, aggregate
+
+    def close(self):
+        for run in self.runs:
+            run.close()
+        self.runs = []
+        self.groups = {}
+        self.size = 0
+
+
+# Product aggregate: [first transaction index, qty, revenue_minor]
+def _start_product(value):
+    return list(value)
+
+
+def _add_product(aggregate, value):
+    aggregate[1] += value[1]
+    aggregate[2] += value[2]
+
+
+def _combine_product(aggregate, other):
+    aggregate[0] = min(aggregate[0], other[0])
+    aggregate[1] += other[1]
+    aggregate[2] += other[2]
+
+
+# Customer aggregate: [first transaction index, spent_minor, orders]
+def _start_customer(value):
+    return [value[0], value[1], 1]
+
+
+def _add_customer(aggregate, value):
+    aggregate[1] += value[1]
+    aggregate[2] += 1
+
+
+def _combine_customer(aggregate, other):
+    aggregate[0] = min(aggregate[0], other[0])
+    aggregate[1] += other[1]
+    aggregate[2] += other[2]
+
+
+# Day aggregate: [revenue_minor, txns, customer set]
+def _start_day(value):
+    return [value[1], 1, {value[0]}]
+
+
+def _add_day(aggregate, value):
+    aggregate[0] += value[1]
+    aggregate[1] += 1
+    customers = aggregate[2]
+    if value[0] not in customers:
+        customers.add(value[0])
+        return 1
+
+
+def _combine_day(aggregate, other):
+    aggregate[0] += other[0]
+    aggregate[1] += other[1]
+    aggregate[2] |= other[2]
+
+
+def _start_none(value):
+    return None
+
+
+def _add_none(aggregate, value):
+    pass
+
+
+def iter_sorted(items, limit=None):
+    """
+    Yields items (tuples) in sorted order with bounded memory
+
+    Up to `limit` items are sorted in memory; longer inputs become sorted
+    runs in temporary files that are merged lazily.
+    """
+    limit = limit or REPORT_GROUP_LIMIT
+    chunk = []
+    runs = []
+    try:
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= limit:
+                chunk.sort()
+                runs.append(_spill_run(chunk))
+                chunk = []
+                if len(runs) >= MAX_OPEN_RUNS:
+                    merged = _spill_run(heapq.merge(*(_read_run(run) for run in runs)))
+                    for run in runs:
+                        run.close()
+                    runs = [merged]
+        chunk.sort()
+        yield from heapq.merge(chunk, *(_read_run(run) for run in runs))
+    finally:
+        for run in runs:
+            run.close()
+
+
+def iter_daily_trend(transactions):
+    """
+    Yields (date, revenue, txns, unique_customers) in date order
+    """
+    days = SpillingGroups(_start_day, _add_day, _combine_day)
+    try:
+        for t in transactions:
+            d = t.get("Date", "").strip()
+            if d:
+                days.add(d, (t.get("CustomerID", ""), amount(t)))
+
+        for d, (revenue, txns, customers) in days.items():
+            yield (d, from_minor_units(revenue), txns, len(customers))
+    finally:
+        days.close()
+
+
+def iter_low_performers(product_totals, threshold=10):
+    """
+    Yields (product, qty, revenue) for products with qty < threshold,
+    sorted by qty ascending (ties in order of first appearance)
+
+    product_totals: (product, [first_index, qty, revenue_minor]) pairs,
+    as yielded by the report's product SpillingGroups
+    """
+    low = iter_sorted(
+        (qty, first, p, rev) for p, (first, qty, rev) in product_totals if qty < threshold)
+    for qty, first, p, rev in low:
+        yield (p, qty, from_minor_units(rev))
+
+
+def iter_failed_products(enriched_transactions):
+    """
+    Yields the names of products that couldn't be enriched, sorted
+    """
+    failed = SpillingGroups(_start_none, _add_none, _add_none)
+    try:
+        for t in enriched_transactions:
+            if t.get("API_Match") is not True and t.get("ProductName"):
+                failed.add(t.get("ProductName").strip(), None)
+
+        for name, _ in failed.items():
+            yield name
+    finally:
+        failed.close()
+
+
+# Section writers
+
+def write_header(f, records):
+    f.write(BANNER)
+    f.write("              SALES ANALYTICS REPORT\n")
+    f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    f.write(f"Records Processed: {records}\n")
+    f.write(BANNER + "\n")
+
+
+def write_overall_summary(f, total_revenue, total_transactions, date_min, date_max):
     avg_order_value = (
         total_revenue / total_transactions) if total_transactions else 0.0
 
-    # Date range
-    dates = [t.get("Date") for t in transactions if t.get("Date")]
-    date_min = min(dates) if dates else "N/A"
-    date_max = max(dates) if dates else "N/A"
+    f.write("OVERALL SUMMARY\n")
+    f.write(SEPARATOR)
+    f.write(f"Total Revenue:        {money(total_revenue)}\n")
+    f.write(f"Total Transactions:   {total_transactions}\n")
+    f.write(f"Average Order Value:  {money(avg_order_value)}\n")
+    f.write(f"Date Range:           {date_min} to {date_max}\n\n")
 
-    # Region-wise performance
-    region_stats = {}
-    for t in transactions:
-        r = t.get("Region", "").strip()
-        rev = amount(t)
-        if r not in region_stats:
-            region_stats[r] = {"total_sales": 0.0, "transaction_count": 0}
-        region_stats[r]["total_sales"] += rev
-        region_stats[r]["transaction_count"] += 1
-
-    # Add percentage + sort
-    region_list = []
-    for r, stats in region_stats.items():
-        pct = (stats["total_sales"] / total_revenue *
-               100) if total_revenue else 0.0
-        region_list.append(
-            (r, stats["total_sales"], pct, stats["transaction_count"]))
-    region_list.sort(key=lambda x: x[1], reverse=True)
-
-    # Top 5 products (by quantity sold)
-    product_stats = {}
-    for t in transactions:
-        p = t.get("ProductName", "").strip()
-        q = int(safe_float(t.get("Quantity", 0)))
-        rev = amount(t)
-        if p not in product_stats:
-            product_stats[p] = {"qty": 0, "rev": 0.0}
-        product_stats[p]["qty"] += q
-        product_stats[p]["rev"] += rev
-
-    top_products = sorted(
-        [(p, v["qty"], v["rev"]) for p, v in product_stats.items()],
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
-
-    # Top 5 customers (by total spent)
-    customer_stats = {}
-    for t in transactions:
-        c = t.get("CustomerID", "").strip()
-        rev = amount(t)
-        if c not in customer_stats:
-            customer_stats[c] = {"spent": 0.0, "orders": 0}
-        customer_stats[c]["spent"] += rev
-        customer_stats[c]["orders"] += 1
-
-    top_customers = sorted(
-        [(c, v["spent"], v["orders"]) for c, v in customer_stats.items()],
-        key=lambda x: x[1],
-        reverse=True
-    )[:5]
-
-    # Daily sales trend
-    daily = {}
-    for t in transactions:
-        d = t.get("Date", "").strip()
-        if not d:
-            continue
-        if d not in daily:
-            daily[d] = {"revenue": 0.0, "txns": 0, "customers": set()}
-        daily[d]["revenue"] += amount(t)
-        daily[d]["txns"] += 1
-        daily[d]["customers"].add(t.get("CustomerID", ""))
-
-    daily_list = []
-    for d, info in daily.items():
-        daily_list.append(
-            (d, info["revenue"], info["txns"], len(info["customers"])))
-    daily_list.sort(key=lambda x: x[0])
-
-    # Best selling day
-    peak_day = ("N/A", 0.0, 0)
-    if daily_list:
-        peak_day = max(daily_list, key=lambda x: x[1])
-        peak_day = (peak_day[0], peak_day[1], peak_day[2])
-
-    # Low performing products (qty < 10)
-    low_perf = sorted(
-        [(p, v["qty"], v["rev"])
-         for p, v in product_stats.items() if v["qty"] < 10],
-        key=lambda x: x[1]
-    )
 
-    # Avg transaction value per region
-    avg_region = []
-    for r, sales, pct, txns in region_list:
-        avg_val = (sales / txns) if txns else 0.0
-        avg_region.append((r, avg_val))
+def write_region_performance(f, region_rows):
+    f.write("REGION-WISE PERFORMANCE\n")
+    f.write(SEPARATOR)
+    f.write(f"{'Region':<10}{'Sales':<15}{'% of Total':<12}{'Transactions'}\n")
+    for r, sales, pct, txns in region_rows:
+        f.write(f"{r:<10}{money(sales):<15}{pct:>8.2f}{'':<4}{txns}\n")
+    f.write("\n")
 
-    # API enrichment summary
-    enriched_count = 0
-    failed_products = set()
 
-    for t in enriched_transactions:
-        if t.get("API_Match") is True:
-            enriched_count += 1
-        else:
-            pname = t.get("ProductName")
-            if pname:
-                failed_products.add(pname.strip())
-
-    success_rate = (enriched_count / len(enriched_transactions)
-                    * 100) if enriched_transactions else 0.0
-
-    # Write report
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(
-            "== == == == == == == == == == == == == == == == == == == == == == == == ==\n")
-        f.write("              SALES ANALYTICS REPORT\n")
-        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Records Processed: {records}\n")
-        f.write(
-            "== == == == == == == == == == == == == == == == == == == == == == == == ==\n\n")
-
-        f.write("OVERALL SUMMARY\n")
-        f.write("--------------------------------------------------\n")
-        f.write(f"Total Revenue:        {money(total_revenue)}\n")
-        f.write(f"Total Transactions:   {total_transactions}\n")
-        f.write(f"Average Order Value:  {money(avg_order_value)}\n")
-        f.write(f"Date Range:           {date_min} to {date_max}\n\n")
-
-        f.write("REGION-WISE PERFORMANCE\n")
-        f.write("--------------------------------------------------\n")
-        f.write(f"{'Region':<10}{'Sales':<15}{'% of Total':<12}{'Transactions'}\n")
-        for r, sales, pct, txns in region_list:
-            f.write(f"{r:<10}{money(sales):<15}{pct:>8.2f}{'':<4}{txns}\n")
-        f.write("\n")
-
-        f.write("TOP 5 PRODUCTS\n")
-        f.write("--------------------------------------------------\n")
-        f.write(f"{'Rank':<6}{'Product':<20}{'Qty Sold':<10}{'Revenue'}\n")
-        for i, (p, qty, rev) in enumerate(top_products, start=1):
-            f.write(f"{i:<6}{p:<20}{qty:<10}{money(rev)}\n")
-        f.write("\n")
-
-        f.write("TOP 5 CUSTOMERS\n")
-        f.write("--------------------------------------------------\n")
-        f.write(f"{'Rank':<6}{'Customer':<12}{'Total Spent':<15}{'Orders'}\n")
-        for i, (c, spent, orders) in enumerate(top_customers, start=1):
-            f.write(
-                f"{i:<6}{c:<12}{money(spent(spent) if False else money(spent)):<15}{orders}\n")
-        f.write("\n")
-
-        f.write("DAILY SALES TREND\n")
-        f.write("--------------------------------------------------\n")
-        f.write(f"{'Date':<12}{'Revenue':<15}{'Txns':<8}{'UniqueCust'}\n")
-        for d, rev, txns, uniq in daily_list:
-            f.write(f"{d:<12}{money(rev):<15}{txns:<8}{uniq}\n")
-        f.write("\n")
-
-        f.write("PRODUCT PERFORMANCE ANALYSIS\n")
-        f.write("--------------------------------------------------\n")
-        f.write(
-            f"Best selling day: {peak_day[0]} | Revenue: {money(peak_day[1])} | Transactions: {peak_day[2]}\n\n")
-
-        f.write("Low performing products(qty < 10):\n")
-        if low_perf:
-            for p, qty, rev in low_perf:
-                f.write(f" - {p} | Qty: {qty} | Revenue: {money(rev)}\n")
-        else:
-            f.write(" - None\n")
-        f.write("\n")
-
-        f.write("Average transaction value per region:\n")
-        for r, avg_val in avg_region:
-            f.write(f" - {r}: {money(avg_val)}\n")
-        f.write("\n")
-
-        f.write("API ENRICHMENT SUMMARY\n")
-        f.write("--------------------------------------------------\n")
-        f.write(
-            f"Total products enriched: {enriched_count}/{len(enriched_transactions)}\n")
-        f.write(f"Success rate: {success_rate:.2f}%\n\n")
-
-        f.write("Products that couldn't be enriched:\n")
-        if failed_products:
-            for p in sorted(failed_products):
-                f.write(f" - {p}\n")
-        else:
-            f.write(" - None\n")
+def write_top_products(f, product_rows, n=5):
+    f.write(f"TOP {n} PRODUCTS\n")
+    f.write(SEPARATOR)
+    f.write(f"{'Rank':<6}{'Product':<20}{'Qty Sold':<10}{'Revenue'}\n")
+    for i, (p, qty, rev) in enumerate(product_rows, start=1):
+        f.write(f"{i:<6}{p:<20}{qty:<10}{money(rev)}\n")
+    f.write("\n")
+
+
+def write_top_customers(f, customer_rows, n=5):
+    f.write(f"TOP {n} CUSTOMERS\n")
+    f.write(SEPARATOR)
+    f.write(f"{'Rank':<6}{'Customer':<12}{'Total Spent':<15}{'Orders'}\n")
+    for i, (c, spent, orders) in enumerate(customer_rows, start=1):
+        f.write(f"{i:<6}{c:<12}{money(spent):<15}{orders}\n")
+    f.write("\n")
+
+
+def write_daily_trend(f, daily_rows):
+    """
+    Writes the daily trend rows as they arrive
+
+    Returns: best selling day as (date, revenue, txns)
+    """
+    f.write("DAILY SALES TREND\n")
+    f.write(SEPARATOR)
+    f.write(f"{'Date':<12}{'Revenue':<15}{'Txns':<8}{'UniqueCust'}\n")
+
+    peak_day = None
+    for d, rev, txns, uniq in daily_rows:
+        f.write(f"{d:<12}{money(rev):<15}{txns:<8}{uniq}\n")
+        if peak_day is None or rev > peak_day[1]:
+            peak_day = (d, rev, txns)
+    f.write("\n")
+
+    return peak_day or ("N/A", 0.0, 0)
+
+
+def write_product_performance(f, peak_day, low_perf_rows, avg_region, threshold=10):
+    f.write("PRODUCT PERFORMANCE ANALYSIS\n")
+    f.write(SEPARATOR)
+    f.write(
+        f"Best selling day: {peak_day[0]} | Revenue: {money(peak_day[1])} | Transactions: {peak_day[2]}\n\n")
+
+    f.write(f"Low performing products(qty < {threshold}):\n")
+    written = False
+    for p, qty, rev in low_perf_rows:
+        f.write(f" - {p} | Qty: {qty} | Revenue: {money(rev)}\n")
+        written = True
+    if not written:
+        f.write(" - None\n")
+    f.write("\n")
+
+    f.write("Average transaction value per region:\n")
+    for r, avg_val in avg_region:
+        f.write(f" - {r}: {money(avg_val)}\n")
+    f.write("\n")
+
+
+def write_enrichment_summary(f, enriched_transactions):
+    enriched_count = sum(
+        1 for t in enriched_transactions if t.get("API_Match") is True)
+    total = len(enriched_transactions)
+    write_enrichment_counts(
+        f, enriched_count, total, iter_failed_products(enriched_transactions))
+
+
+def write_enrichment_counts(f, enriched_count, total, failed_products):
+    success_rate = (enriched_count / total * 100) if total else 0.0
+
+    f.write("API ENRICHMENT SUMMARY\n")
+    f.write(SEPARATOR)
+    f.write(f"Total products enriched: {enriched_count}/{total}\n")
+    f.write(f"Success rate: {success_rate:.2f}%\n\n")
+
+    f.write("Products that couldn't be enriched:\n")
+    written = False
+    for p in failed_products:
+        f.write(f" - {p}\n")
+        written = True
+    if not written:
+        f.write(" - None\n")
@@ -0,0 +1,349 @@
+# utils/sales_cube.py
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from utils.file_handler import parse_date, parse_date_range
+from utils.money import line_amount, from_minor_units
+
+
+class SalesCube:
+    """
+    In-memory cube over (Region, ProductName, Date)
+
+    The cube is sparse. For every (region, product) pair with sales it
+    keeps only the dates that have sales, in calendar order, with running
+    totals of three measures (quantity, revenue in integer minor units,
+    transaction count) and the position of each cell's first transaction.
+    The same layout is precomputed per product (over all regions), per
+    region (over all products) and for everything. Memory grows with the
+    number of non-empty cells rather than regions x products x days, and
+    any date range is two binary searches in a cell's dates. Transactions
+    are only read once, by the constructor.
+
+    Regions are matched case-insensitively, like validate_and_filter(
+    region=...): 'North' and 'north' stay separate in region_wise_sales()
+    but a 'north' slice covers both. Ties are broken by first appearance
+    within the slice, as in utils.data_processor.
+
+    Rows whose Date can't be parsed are left out (counted in `skipped`).
+    numpy is imported on first use only.
+
+    Example:
+        cube = SalesCube(valid_transactions)
+        cube.top_selling_products(3, region='North', start_date='2024-12-24')
+    """
+
+    def __init__(self, transactions):
+        import numpy as np
+
+        self.np = np
+
+        region_codes = {}
+        product_codes = {}
+        rows = []
+        self.skipped = 0
+
+        for position, t in enumerate(transactions):
+            d = parse_date(t['Date'])
+            if d is None:
+                self.skipped += 1
+                continue
+            r = region_codes.setdefault(t['Region'], len(region_codes))
+            p = product_codes.setdefault(t['ProductName'], len(product_codes))
+            rows.append((r, p, d.toordinal(), position, t['Quantity'], line_amount(t)))
+
+        self.regions = list(region_codes)
+        self.products = list(product_codes)
+        self.dates = [date.fromordinal(day) for day in sorted({row[2] for row in rows})]
+        self._product_codes = product_codes
+        self._region_lookup = {}
+        for name, code in region_codes.items():
+            self._region_lookup.setdefault(name.lower(), []).append(code)
+
+        r_idx, p_idx, days, positions, quantity, revenue = (
+            np.fromiter((row[i] for row in rows), dtype=np.int64, count=len(rows))
+            for i in range(6))
+        measures = np.vstack([quantity, revenue, np.ones(len(rows), dtype=np.int64)])
+
+        self._cells = _build_lines(np, r_idx * len(self.products) + p_idx, days, positions, measures)
+        self._by_product = _build_lines(np, p_idx, days, positions, measures)
+        self._by_region = _build_lines(np, r_idx, days, positions, measures)
+        self._all = _build_lines(np, np.zeros_like(days), days, positions, measures).get(0)
+
+    def __len__(self):
+        return 0 if self._all is None else int(self._all[1][COUNT, -1])
+
+    # Dimension lookups
+
+    def _region(self, region):
+        # None = all regions; [] = unknown region (empty slice)
+        if region is None:
+            return None
+        return self._region_lookup.get(region.lower(), [])
+
+    def _date_range(self, start_date=None, end_date=None):
+        """
+        Returns: (start, end) as date ordinals, None = open
+        """
+        start, end = parse_date_range(start_date, end_date)
+        return (start.toordinal() if start is not None else None,
+                end.toordinal() if end is not None else None)
+
+    def _lines(self, codes, product):
+        # the lines making up one (region codes, product code) slice
+        if codes is None and product is None:
+            lines = [self._all]
+        elif codes is None:
+            lines = [self._by_product.get(product)]
+        elif product is None:
+            lines = [self._by_region.get(r) for r in codes]
+        else:
+            lines = [self._cells.get(r * len(self.products) + product) for r in codes]
+        return [line for line in lines if line is not None]
+
+    def _total(self, lines, start, end):
+        """
+        Returns: (quantity, revenue, count, first position) summed over
+        the lines and dates, or None if the slice has no sales
+        """
+        total = None
+        first = None
+        for line in lines:
+            days, cum, positions = line
+            s = 0 if start is None else bisect_left(days, start)
+            e = len(days) if end is None else bisect_right(days, end)
+            if e <= s:
+                continue
+            sums = cum[:, e] - cum[:, s]
+            total = sums if total is None else total + sums
+            line_first = int(positions[s:e].min())
+            first = line_first if first is None else min(first, line_first)
+        if total is None:
+            return None
+        return int(total[QUANTITY]), int(total[REVENUE]), int(total[COUNT]), first
+
+    def _per_product(self, region, start_date, end_date):
+        # [(first position, product, quantity, revenue)] of one slice
+        codes = self._region(region)
+        start, end = self._date_range(start_date, end_date)
+        result = []
+        for p, name in enumerate(self.products):
+            total = self._total(self._lines(codes, p), start, end)
+            if total is not None:
+                quantity, revenue, count, first = total
+                result.append((first, name, quantity, revenue))
+        return result
+
+    # Queries
+
+    def totals(self, region=None, product=None, start_date=None, end_date=None):
+        """
+        Returns: {'quantity': int, 'revenue': float, 'transaction_count': int}
+        for one slice of the cube (None = all values of a dimension)
+        """
+        codes = self._region(region)
+        start, end = self._date_range(start_date, end_date)
+        p = None if product is None else self._product_codes.get(product)
+        total = None
+        if product is None or p is not None:
+            total = self._total(self._lines(codes, p), start, end)
+        if total is None:
+            return {'quantity': 0, 'revenue': 0.0, 'transaction_count': 0}
+
+        quantity, revenue, count, first = total
+        return {
+            'quantity': quantity,
+            'revenue': round(from_minor_units(revenue), 2),
+            'transaction_count': count
+        }
+
+    def top_selling_products(self, n=5, region=None, start_date=None, end_date=None):
+        """
+        Cube version of top_selling_products() for any region / date slice
+
+        Returns: list of (ProductName, TotalQuantity, TotalRevenue), sorted
+        by quantity descending; ties keep first-appearance order
+        """
+        products = self._per_product(region, start_date, end_date)
+        products.sort(key=lambda x: (-x[2], x[0]))
+        if n is not None:
+            products = products[:n]
+        return [(name, quantity, round(from_minor_units(revenue), 2))
+                for first, name, quantity, revenue in products]
+
+    def low_performing_products(self, threshold=10, region=None, start_date=None, end_date=None):
+        """
+        Cube version of low_performing_products() for any region / date slice
+
+        Returns: list of (ProductName, TotalQuantity, TotalRevenue) with
+        quantity < threshold, sorted by quantity ascending
+        """
+        products = [x for x in self._per_product(region, start_date, end_date) if x[2] < threshold]
+        products.sort(key=lambda x: (x[2], x[0]))
+        return [(name, quantity, round(from_minor_units(revenue), 2))
+                for first, name, quantity, revenue in products]
+
+    def region_wise_sales(self, product=None, start_date=None, end_date=None):
+        """
+        Cube version of region_wise_sales() for any product / date slice
+
+        Returns: {region: {'total_sales', 'transaction_count', 'percentage'}}
+        sorted by total_sales descending
+        """
+        p = None if product is None else self._product_codes.get(product)
+        if product is not None and p is None:
+            return {}
+        start, end = self._date_range(start_date, end_date)
+
+        regions = []
+        for r, name in enumerate(self.regions):
+            total = self._total(self._lines([r], p), start, end)
+            if total is not None:
+                quantity, revenue, count, first = total
+                regions.append((first, name, revenue, count))
+        regions.sort(key=lambda x: (-x[2], x[0]))
+
+        total_revenue = round(from_minor_units(sum(x[2] for x in regions)), 2)
+        region_stats = {}
+        for first, name, revenue, count in regions:
+            total_sales = round(from_minor_units(revenue), 2)
+            region_stats[name] = {
+                'total_sales': total_sales,
+                'transaction_count': count,
+                'percentage': round(
+                    (total_sales / total_revenue) * 100, 2) if total_revenue > 0 else 0.0
+            }
+        return region_stats
+
+    def daily_sales(self, region=None, product=None, start_date=None, end_date=None):
+        """
+        Per-day quantity, revenue and transaction count of one slice
+
+        Returns: {'2024-12-01': {'quantity': 5, 'revenue': 123969.0,
+                                 'transaction_count': 3}, ...}
+        in date order; days without sales in the slice are left out
+        """
+        codes = self._region(region)
+        p = None if product is None else self._product_codes.get(product)
+        if product is not None and p is None:
+            return {}
+        start, end = self._date_range(start_date, end_date)
+
+        np = self.np
+        per_day = {}
+        for days, cum, positions in self._lines(codes, p):
+            s = 0 if start is None else bisect_left(days, start)
+            e = len(days) if end is None else bisect_right(days, end)
+            for day, sums in zip(days[s:e], np.diff(cum[:, s:e + 1], axis=1).T):
+                per_day[day] = per_day[day] + sums if day in per_day else sums
+
+        return {
+            date.fromordinal(day).isoformat(): {
+                'quantity': int(per_day[day][QUANTITY]),
+                'revenue': round(from_minor_units(int(per_day[day][REVENUE])), 2),
+                'transaction_count': int(per_day[day][COUNT])
+            }
+            for day in sorted(per_day)
+        }
+
+
+# Rows of a line's running totals
+QUANTITY, REVENUE, COUNT = 0, 1, 2
+
+
+def _build_lines(np, keys, days, positions, measures):
+    """
+    Groups transactions by key into sparse per-day running totals
+
+    - keys, days (ordinals), positions: one int64 entry per transaction
+    - measures: 3 x transactions array (quantity, revenue, count)
+
+    Returns: {key: (days, cum, first)} - the key's distinct days (a sorted
+    list), running totals per measure with a leading zero (3 x days+1, so
+    days[s:e] sum to cum[:, e] - cum[:, s]) and the position of each
+    day's first transaction
+    """
+    if not len(keys):
+        return {}
+
+    order = np.lexsort((positions, days, keys))
+    keys, days, positions, measures = keys[order], days[order], positions[order], measures[:, order]
+
+    # one cell per (key, day); sorted by position within, so the first
+    # row of a cell is its first transaction
+    new_cell = np.ones(len(keys), dtype=bool)
+    new_cell[1:] = (keys[1:] != keys[:-1]) | (days[1:] != days[:-1])
+    starts = np.flatnonzero(new_cell)
+    cell_keys, cell_days, cell_first = keys[starts], days[starts], positions[starts]
+    cell_sums = np.add.reduceat(measures, starts, axis=1)
+
+    bounds = np.flatnonzero(np.r_[True, cell_keys[1:] != cell_keys[:-1], True])
+    lines = {}
+    for s, e in zip(bounds[:-1], bounds[1:]):
+        cum = np.zeros((3, e - s + 1), dtype=np.int64)
+        np.cumsum(cell_sums[:, s:e], axis=1, out=cum[:, 1:])
+        lines[int(cell_keys[s])] = (cell_days[s:e].tolist(), cum, cell_first[s:e])
+    return lines
+
+
+def benchmark(rows=500_000, queries=200, seed=11):
+    """
+    "Top products in <region> for <7-day window>" answered by filtering
+    and rescanning vs. by the cube
+
+    Returns: dictionary {strategy: seconds}
+
+    Run with: python -m utils.sales_cube
+    """
+    import random
+    import time
+    from datetime import date, timedelta
+
+    from utils.data_processor import top_selling_products
+
+    rng = random.Random(seed)
+    regions = ['North', 'South', 'East', 'West']
+    products = [f"Product {i}" for i in range(50)]
+    first = date(2024, 1, 1)
+    transactions = [
+        {
+            'Date': (first + timedelta(days=rng.randrange(366))).isoformat(),
+            'Region': rng.choice(regions),
+            'ProductName': rng.choice(products),
+            'Quantity': rng.randint(1, 10),
+            'UnitPrice': rng.randint(100, 500_000) / 100
+        }
+        for _ in range(rows)
+    ]
+    windows = []
+    for _ in range(queries):
+        start = first + timedelta(days=rng.randrange(360))
+        windows.append((rng.choice(regions), start, start + timedelta(days=6)))
+
+    results = {}
+
+    start = time.perf_counter()
+    for region, since, until in windows:
+        top_selling_products([
+            t for t in transactions
+            if t['Region'] == region and since <= parse_date(t['Date']) <= until
+        ])
+    results['filter_and_rescan'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cube = SalesCube(transactions)
+    results['cube_build'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for region, since, until in windows:
+        cube.top_selling_products(5, region, since, until)
+    results['cube_queries'] = time.perf_counter() - start
+
+    return results
+
+
+if __name__ == "__main__":
+    results = benchmark()
+    for name, seconds in results.items():
+        print(f"{name:<20}{seconds:.3f}s")
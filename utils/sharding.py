@@ -0,0 +1,121 @@
+# utils/sharding.py
+
+import os
+import re
+
+from utils.report_generator import generate_sales_report
+
+
+def partition_by_region(transactions, enriched_transactions):
+    """
+    Splits transactions into one shard per region in a single pass
+
+    Returns: dictionary keyed by region (as first seen in the data)
+    {
+        'North': {'transactions': [...], 'enriched': [...]},
+        ...
+    }
+
+    Regions are matched case-insensitively, the same way
+    validate_and_filter(region=...) matches them, so each shard holds
+    exactly what a filtered single run would keep. Transactions without a
+    region can't be selected by that filter and only appear in the global
+    report.
+    """
+    shards = {}
+    names = {}
+
+    for t, e in zip(transactions, enriched_transactions):
+        key = t['Region'].lower()
+        if not key:
+            continue
+
+        if key not in names:
+            names[key] = t['Region']
+            shards[names[key]] = {'transactions': [], 'enriched': []}
+
+        shard = shards[names[key]]
+        shard['transactions'].append(t)
+        shard['enriched'].append(e)
+
+    return shards
+
+
+def _slug(region):
+    # 'North East' -> 'north_east'
+    return re.sub(r'[^a-z0-9]+', '_', region.lower()).strip('_') or 'unknown'
+
+
+def shard_report_path(region, output_dir="output"):
+    # 'North' -> output/sales_report_north.txt
+    return os.path.join(output_dir, f"sales_report_{_slug(region)}.txt")
+
+
+def shard_report_paths(regions, output_dir="output"):
+    """
+    Returns: dictionary {region: report path}, one distinct file per region
+
+    Regions whose names slug the same ('North-East' and 'North East')
+    get a numbered suffix in the order given: sales_report_north_east.txt,
+    sales_report_north_east_2.txt, ...
+    """
+    paths = {}
+    taken = set()
+    for region in regions:
+        base = slug = _slug(region)
+        count = 1
+        while slug in taken:
+            count += 1
+            slug = f"{base}_{count}"
+        taken.add(slug)
+        paths[region] = os.path.join(output_dir, f"sales_report_{slug}.txt")
+    return paths
+
+
+def generate_sharded_reports(transactions, enriched_transactions, output_dir="output", max_workers=None):
+    """
+    Writes one report per region plus a global report
+
+    - transactions: validated transactions (no region filter applied)
+    - enriched_transactions: enrich_sales_data() output for the same list
+    - max_workers: process pool size (default: os.cpu_count())
+
+    Region reports are formatted in a process pool while the global report
+    is written in this process, so each row is sent to the pool only once
+    (inside its shard). With a single worker (or CPU), or if the pool can't
+    be started, the reports are written one after another.
+
+    Returns: dictionary {region or 'ALL': report path}
+    """
+    shards = partition_by_region(transactions, enriched_transactions)
+    paths = shard_report_paths(shards, output_dir)
+    jobs = {region: (shard['transactions'], shard['enriched'], paths[region])
+            for region, shard in shards.items()}
+    global_path = os.path.join(output_dir, "sales_report.txt")
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                futures = [pool.submit(generate_sales_report, *job)
+                           for job in jobs.values()]
+                generate_sales_report(transactions, enriched_transactions, global_path)
+                for future in futures:
+                    future.result()
+            jobs = {}
+
+        except (OSError, NotImplementedError) as e:
+            print(f"Process pool unavailable ({e}). Writing reports sequentially.")
+
+    if jobs:
+        generate_sales_report(transactions, enriched_transactions, global_path)
+        for job in jobs.values():
+            generate_sales_report(*job)
+
+    reports = {'ALL': global_path}
+    reports.update(paths)
+    return reports
@@ -0,0 +1,135 @@
+# utils/snapshot.py
+
+import gzip
+import json
+import os
+from datetime import datetime
+
+from utils.file_handler import atomic_write
+from utils.money import to_minor_units
+
+# Bump when the layout below changes; load_snapshot() refuses other versions
+SNAPSHOT_VERSION = 1
+
+
+def build_snapshot(total_revenue, region_stats, product_stats, customer_stats, daily_trend,
+                   enriched_count, enriched_total, failed_products):
+    """
+    Collects the analysis results into a snapshot dictionary
+
+    Parameters (as returned by utils.data_processor / a backend):
+    - total_revenue: calculate_total_revenue()
+    - region_stats: region_wise_sales()
+    - product_stats: top_selling_products(n=None) - every product
+    - customer_stats: customer_analysis()
+    - daily_trend: daily_sales_trend()
+    - enriched_count / enriched_total / failed_products: enrichment results
+
+    Amounts are stored as integer minor units so a report rebuilt from the
+    snapshot matches one built from the transactions to the cent.
+
+    Expected Output Format:
+    {
+        'version': 1,
+        'records': 71,
+        'total_revenue': 354020500,
+        'regions': [['North', 132160500, 21], ...],
+        'products': [['Mouse', 61, 4029700], ...],
+        'customers': [['C004', 85712400, 3, 28570800, ['Laptop', ...]], ...],
+        'daily': [['2024-12-01', 12396900, 3, 2], ...],
+        'enrichment': {'enriched': 0, 'total': 71, 'failed_products': [...]}
+    }
+    """
+    return {
+        'version': SNAPSHOT_VERSION,
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'records': sum(s['transaction_count'] for s in region_stats.values()),
+        'total_revenue': to_minor_units(total_revenue),
+        'regions': [
+            [region, to_minor_units(s['total_sales']), s['transaction_count']]
+            for region, s in region_stats.items()
+        ],
+        'products': [
+            [name, qty, to_minor_units(revenue)]
+            for name, qty, revenue in product_stats
+        ],
+        'customers': [
+            [customer, to_minor_units(s['total_spent']), s['purchase_count'],
+             to_minor_units(s['avg_order_value']), s['products_bought']]
+            for customer, s in customer_stats.items()
+        ],
+        'daily': [
+            [date, to_minor_units(s['revenue']), s['transaction_count'], s['unique_customers']]
+            for date, s in daily_trend.items()
+        ],
+        'enrichment': {
+            'enriched': enriched_count,
+            'total': enriched_total,
+            'failed_products': list(failed_products)
+        }
+    }
+
+
+def save_snapshot(snapshot, filename="output/analytics_snapshot.json.gz"):
+    """
+    Writes the snapshot as gzip-compressed compact JSON
+    """
+    folder = os.path.dirname(filename)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+
+    with atomic_write(filename, 'wb') as raw, gzip.open(raw, 'wt', encoding='utf-8') as file:
+        json.dump(snapshot, file, separators=(',', ':'))
+
+
+def load_snapshot(filename="output/analytics_snapshot.json.gz"):
+    """
+    Reads a snapshot written by save_snapshot()
+
+    Returns: snapshot dictionary, or None if the file is missing, unreadable
+    or was written by a different snapshot version
+    """
+    try:
+        with gzip.open(filename, 'rt', encoding='utf-8') as file:
+            snapshot = json.load(file)
+    except FileNotFoundError:
+        print(f"Error: Snapshot not found - {filename}")
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error: Unable to read snapshot {filename}: {e}")
+        return None
+
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        print(f"Error: Snapshot version {snapshot.get('version')} is not supported "
+              f"(expected {SNAPSHOT_VERSION}). Re-run the full pipeline.")
+        return None
+
+    return snapshot
+
+
+# Derived views
+
+def snapshot_top_products(snapshot, n=5):
+    """
+    Returns: top n products by quantity as (name, qty, revenue_minor)
+    """
+    # products are stored sorted by quantity, descending
+    return [tuple(p) for p in snapshot['products'][:n]]
+
+
+def snapshot_low_performers(snapshot, threshold=10):
+    """
+    Returns: products with qty < threshold as (name, qty, revenue_minor),
+    sorted by quantity ascending
+    """
+    low = [tuple(p) for p in snapshot['products'] if p[1] < threshold]
+    low.sort(key=lambda x: x[1])
+    return low
+
+
+def snapshot_top_customers(snapshot, n=5):
+    """
+    Returns: top n customers by total spent as (id, spent_minor, orders)
+    """
+    # customers are stored sorted by total spent, descending
+    return [(c[0], c[1], c[2]) for c in snapshot['customers'][:n]]
@@ -0,0 +1,255 @@
+# utils/sqlite_store.py
+
+import sqlite3
+
+from utils.money import to_minor_units, from_minor_units
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    transaction_id   TEXT NOT NULL,
+    date             TEXT NOT NULL,
+    product_id       TEXT NOT NULL,
+    product_name     TEXT NOT NULL,
+    quantity         INTEGER NOT NULL,
+    unit_price       REAL NOT NULL,
+    unit_price_minor INTEGER NOT NULL,
+    customer_id      TEXT NOT NULL,
+    region           TEXT NOT NULL,
+    api_category     TEXT,
+    api_brand        TEXT,
+    api_rating       REAL,
+    api_match        INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (date);
+-- Region filters compare case-insensitively (like validate_and_filter), so
+-- the index uses the same collation; the column stays BINARY so GROUP BY
+-- region keeps 'North' and 'north' apart, as region_wise_sales() does
+CREATE INDEX IF NOT EXISTS idx_transactions_region_nocase ON transactions (region COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_transactions_product ON transactions (product_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_customer ON transactions (customer_id);
+"""
+
+# Revenue of one row in minor units (exact integer arithmetic in SQLite)
+AMOUNT = "quantity * unit_price_minor"
+
+
+def open_database(filename="data/sales.db"):
+    """
+    Opens (or creates) the SQLite transaction store
+
+    - WAL journal mode so readers don't block the loader
+    - Indexes on Date, Region (case-insensitive), ProductID and CustomerID
+    """
+    conn = sqlite3.connect(filename)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def load_transactions(conn, transactions, replace=False, replace_dates=None):
+    """
+    Bulk-loads validated (optionally enriched) transactions
+
+    All rows go in with a single executemany() inside one transaction.
+    replace=True empties the table first. replace_dates, a list of
+    (min_date, max_date) pairs, only deletes the rows in those date ranges
+    first, e.g. the date partitions that were read again.
+
+    Returns: number of rows inserted
+    """
+    rows = (
+        (
+            t['TransactionID'], t['Date'], t['ProductID'], t['ProductName'],
+            t['Quantity'], t['UnitPrice'], to_minor_units(t['UnitPrice']),
+            t['CustomerID'], t['Region'],
+            t.get('API_Category'), t.get('API_Brand'), t.get('API_Rating'),
+            None if t.get('API_Match') is None else int(t['API_Match'])
+        )
+        for t in transactions
+    )
+
+    with conn:
+        if replace:
+            conn.execute("DELETE FROM transactions")
+        elif replace_dates:
+            conn.executemany(
+                "DELETE FROM transactions WHERE date BETWEEN ? AND ?", replace_dates)
+        cursor = conn.executemany(
+            "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    return cursor.rowcount
+
+
+def _where(region=None, start_date=None, end_date=None):
+    # Builds a WHERE clause that can use the Date / Region indexes
+    clauses = []
+    params = []
+    if region:
+        clauses.append("region = ? COLLATE NOCASE")
+        params.append(region)
+    if start_date:
+        clauses.append("date >= ?")
+        params.append(start_date)
+    if end_date:
+        clauses.append("date <= ?")
+        params.append(end_date)
+
+    where = (" WHERE " + " AND ".join(clauses)) if clauses else ""
+    return where, params
+
+
+def query_transactions(conn, region=None, start_date=None, end_date=None):
+    """
+    Returns: list of transaction dictionaries (same keys as parse_transactions)
+    """
+    where, params = _where(region, start_date, end_date)
+    cursor = conn.execute(
+        "SELECT transaction_id, date, product_id, product_name, quantity, unit_price,"
+        " customer_id, region FROM transactions" + where + " ORDER BY rowid", params)
+
+    keys = ['TransactionID', 'Date', 'ProductID', 'ProductName',
+            'Quantity', 'UnitPrice', 'CustomerID', 'Region']
+    return [dict(zip(keys, row)) for row in cursor]
+
+
+# SQL versions of utils.data_processor
+# Ties are broken by first appearance (MIN(rowid)), like Python's stable sort
+
+
+def query_total_revenue(conn, region=None, start_date=None, end_date=None):
+    """
+    SQL version of calculate_total_revenue()
+    """
+    where, params = _where(region, start_date, end_date)
+    total = conn.execute(
+        f"SELECT COALESCE(SUM({AMOUNT}), 0) FROM transactions" + where, params).fetchone()[0]
+    return round(from_minor_units(total), 2)
+
+
+def query_region_wise_sales(conn, region=None, start_date=None, end_date=None):
+    """
+    SQL version of region_wise_sales()
+    """
+    total_revenue = query_total_revenue(conn, region, start_date, end_date)
+    where, params = _where(region, start_date, end_date)
+    cursor = conn.execute(
+        f"SELECT region, SUM({AMOUNT}) AS sales, COUNT(*) FROM transactions" + where +
+        " GROUP BY region ORDER BY sales DESC, MIN(rowid)", params)
+
+    region_stats = {}
+    for name, sales, count in cursor:
+        total_sales = round(from_minor_units(sales), 2)
+        region_stats[name] = {
+            'total_sales': total_sales,
+            'transaction_count': count,
+            'percentage': round(
+                (total_sales / total_revenue) * 100, 2) if total_revenue > 0 else 0.0
+        }
+    return region_stats
+
+
+def _product_totals(conn, order, having="", having_params=(), region=None, start_date=None, end_date=None):
+    where, params = _where(region, start_date, end_date)
+    cursor = conn.execute(
+        f"SELECT product_name, SUM(quantity) AS qty, SUM({AMOUNT}) FROM transactions" + where +
+        " GROUP BY product_name" + having + " ORDER BY " + order,
+        params + list(having_params))
+    return [(name, qty, round(from_minor_units(rev), 2)) for name, qty, rev in cursor]
+
+
+def query_top_selling_products(conn, n=5, region=None, start_date=None, end_date=None):
+    """
+    SQL version of top_selling_products()
+    """
+    result = _product_totals(conn, "qty DESC, MIN(rowid)",
+                             region=region, start_date=start_date, end_date=end_date)
+    return result[:n]
+
+
+def query_low_performing_products(conn, threshold=10, region=None, start_date=None, end_date=None):
+    """
+    SQL version of low_performing_products()
+    """
+    return _product_totals(conn, "qty ASC, MIN(rowid)", " HAVING qty < ?", (threshold,),
+                           region=region, start_date=start_date, end_date=end_date)
+
+
+def query_customer_analysis(conn, region=None, start_date=None, end_date=None):
+    """
+    SQL version of customer_analysis()
+    """
+    where, params = _where(region, start_date, end_date)
+
+    products = {}
+    for customer, product in conn.execute(
+            "SELECT DISTINCT customer_id, product_name FROM transactions" + where, params):
+        products.setdefault(customer, []).append(product)
+
+    cursor = conn.execute(
+        f"SELECT customer_id, SUM({AMOUNT}) AS spent, COUNT(*) FROM transactions" + where +
+        " GROUP BY customer_id ORDER BY spent DESC, MIN(rowid)", params)
+
+    customer_stats = {}
+    for customer, spent, count in cursor:
+        spent = from_minor_units(spent)
+        customer_stats[customer] = {
+            'total_spent': round(spent, 2),
+            'purchase_count': count,
+            'products_bought': sorted(products.get(customer, [])),
+            'avg_order_value': round(spent / count, 2) if count > 0 else 0.0
+        }
+    return customer_stats
+
+
+def query_daily_sales_trend(conn, region=None, start_date=None, end_date=None):
+    """
+    SQL version of daily_sales_trend()
+    """
+    where, params = _where(region, start_date, end_date)
+    cursor = conn.execute(
+        f"SELECT date, SUM({AMOUNT}), COUNT(*), COUNT(DISTINCT customer_id)"
+        " FROM transactions" + where + " GROUP BY date ORDER BY date", params)
+
+    return {
+        date: {
+            'revenue': round(from_minor_units(revenue), 2),
+            'transaction_count': count,
+            'unique_customers': customers
+        }
+        for date, revenue, count, customers in cursor
+    }
+
+
+def query_peak_sales_day(conn, region=None, start_date=None, end_date=None):
+    """
+    SQL version of find_peak_sales_day()
+    """
+    where, params = _where(region, start_date, end_date)
+    row = conn.execute(
+        f"SELECT date, SUM({AMOUNT}) AS revenue, COUNT(*) FROM transactions" + where +
+        " GROUP BY date HAVING revenue > 0 ORDER BY revenue DESC, date LIMIT 1", params).fetchone()
+
+    if row is None:
+        return (None, 0.0, 0)
+    return (row[0], round(from_minor_units(row[1]), 2), row[2])
+
+
+def query_enrichment(conn, region=None, start_date=None, end_date=None):
+    """
+    Enrichment figures of the stored rows, as the report shows them
+
+    Returns: (enriched count, total count, sorted names of the products
+    that couldn't be enriched)
+    """
+    where, params = _where(region, start_date, end_date)
+    enriched, total = conn.execute(
+        "SELECT COALESCE(SUM(api_match = 1), 0), COUNT(*) FROM transactions" + where,
+        params).fetchone()
+
+    failed_where = (where + " AND" if where else " WHERE") + \
+        " (api_match IS NULL OR api_match != 1) AND TRIM(product_name) != ''"
+    failed = [name for (name,) in conn.execute(
+        "SELECT DISTINCT TRIM(product_name) AS name FROM transactions" + failed_where +
+        " ORDER BY name", params)]
+    return enriched, total, failed
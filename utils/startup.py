@@ -0,0 +1,133 @@
+# utils/startup.py
+
+import os
+import subprocess
+import sys
+import time
+
+# Modules that must only be imported on first use (never at startup)
+HEAVY_MODULES = ['pandas', 'numpy', 'requests']
+
+# Budgets are about twice the measured values (warm .pyc files, best of
+# IMPORT_RUNS / cold start runs):
+# - import of main.py (cumulative, from -X importtime): ~12-17 ms
+# - smallest pipeline path (read + validate + total revenue on the
+#   sample file) on top of a bare interpreter: ~10-13 ms
+# A single -X importtime run on a busy machine can take 2-3x longer,
+# so the import is measured several times and the fastest run counts.
+IMPORT_BUDGET_MS = 40
+COLD_START_BUDGET_MS = 30
+IMPORT_RUNS = 5
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SMALLEST_PIPELINE = (
+    "from utils.backends import get_backend\n"
+    "backend = get_backend('python')\n"
+    "valid, invalid, summary = backend.validate_and_filter("
+    "backend.load('data/sales_data.txt'))\n"
+    "backend.calculate_total_revenue(valid)\n"
+)
+
+
+def _run_python(args):
+    return subprocess.run(
+        [sys.executable] + args,
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONPATH': PROJECT_ROOT}
+    )
+
+
+def measure_import_time(module="main"):
+    """
+    Imports a module in a fresh interpreter with -X importtime
+
+    Returns: dictionary {module_name: cumulative microseconds}
+
+    Expected Output Format:
+    {'utils.money': 310, 'utils.backends': 2950, 'main': 8700, ...}
+    """
+    result = _run_python(["-X", "importtime", "-c", f"import {module}"])
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative)
+
+    return timings
+
+
+def measure_cold_start(code=SMALLEST_PIPELINE, runs=5):
+    """
+    Measures wall time of running code in a fresh interpreter
+
+    Returns: best-of-runs milliseconds, minus a bare interpreter start
+
+    Raises RuntimeError if the code fails, so a broken pipeline can't pass
+    as a fast one.
+    """
+    def best(args):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = _run_python(args)
+            times.append(time.perf_counter() - start)
+            if result.returncode != 0:
+                raise RuntimeError(f"Cold start run failed:\n{result.stderr}")
+        return min(times) * 1000
+
+    return best(["-c", code]) - best(["-c", "pass"])
+
+
+def check_startup(import_budget_ms=IMPORT_BUDGET_MS, cold_start_budget_ms=COLD_START_BUDGET_MS):
+    """
+    Checks main.py startup against the budgets
+
+    Returns: (list of problems, measurements dictionary)
+    An empty problem list means startup is within budget.
+    """
+    problems = []
+
+    timings = min((measure_import_time("main") for _ in range(IMPORT_RUNS)),
+                  key=lambda t: t.get("main", 0))
+    import_ms = timings.get("main", 0) / 1000
+
+    for name in timings:
+        if name.split(".")[0] in HEAVY_MODULES:
+            problems.append(f"'{name}' is imported at startup")
+
+    if import_ms > import_budget_ms:
+        problems.append(
+            f"import main took {import_ms:.1f} ms (budget {import_budget_ms} ms)")
+
+    cold_start_ms = measure_cold_start()
+    if cold_start_ms > cold_start_budget_ms:
+        problems.append(
+            f"smallest pipeline took {cold_start_ms:.1f} ms (budget {cold_start_budget_ms} ms)")
+
+    measurements = {
+        'import_main_ms': round(import_ms, 2),
+        'cold_start_ms': round(cold_start_ms, 2)
+    }
+    return problems, measurements
+
+
+if __name__ == "__main__":
+    problems, measurements = check_startup()
+    print(f"import main:       {measurements['import_main_ms']:.2f} ms (budget {IMPORT_BUDGET_MS} ms)")
+    print(f"smallest pipeline: {measurements['cold_start_ms']:.2f} ms (budget {COLD_START_BUDGET_MS} ms)")
+
+    if problems:
+        print("\nStartup budget exceeded:")
+        for problem in problems:
+            print(f" - {problem}")
+        sys.exit(1)
+
+    print("Startup within budget")
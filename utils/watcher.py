@@ -0,0 +1,162 @@
+# utils/watcher.py
+
+import hashlib
+import os
+import time
+
+# FileWatcher.check() results
+UNCHANGED = "unchanged"
+APPENDED = "appended"
+REPLACED = "replaced"
+MISSING = "missing"
+
+# Processed bytes re-read to confirm the file was only appended to
+TAIL_CHECK = 4096
+
+
+class FileWatcher:
+    """
+    Tracks an input file by inode, size, mtime and a running content hash
+
+    check() compares the file with what was processed so far:
+    - UNCHANGED: same size and mtime, or only touched (same content)
+    - APPENDED: the same file grew; only the new bytes after the
+      processed ones are returned
+    - REPLACED: anything else (first check, a new file under the name,
+      truncated, edited near the end); the whole content is returned
+    - MISSING: the file doesn't exist (state is kept)
+
+    Bytes are only processed up to the last newline, since a writer may
+    still be adding to the last line. A last line without a newline is
+    processed once the file has stopped changing (same size and mtime on
+    two checks); if bytes are appended to it after that, the file counts
+    as REPLACED.
+
+    Appends are recognized without re-reading the processed part: the
+    inode must be the same, the file no smaller, and its last TAIL_CHECK
+    processed bytes unchanged. The hash of the processed bytes is kept up
+    to date as data comes in, and tells a rewrite with identical content
+    (e.g. an editor saving via rename) from a real change.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.inode = None
+        self.size = None
+        self.mtime_ns = None
+        self.offset = 0          # bytes processed so far
+        self._hasher = None      # sha256 of those bytes
+        self._tail = b''         # their last TAIL_CHECK bytes
+        self._ends_with_newline = True
+
+    def check(self):
+        """
+        Returns: (status, data) - data is the bytes to process (b'' for
+        UNCHANGED / MISSING)
+        """
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return MISSING, b''
+
+        inode = (stat.st_dev, stat.st_ino)
+        settled = (inode == self.inode and stat.st_size == self.size
+                   and stat.st_mtime_ns == self.mtime_ns)
+        if settled and stat.st_size == self.offset:
+            return UNCHANGED, b''
+
+        with open(self.filename, 'rb') as file:
+            status = REPLACED
+            if self._hasher is not None and inode == self.inode and stat.st_size >= self.offset:
+                start = max(self.offset - len(self._tail), 0)
+                file.seek(start)
+                if file.read(self.offset - start) == self._tail:
+                    status = APPENDED
+
+            if status == APPENDED:
+                data = self._complete(file.read(), settled)
+                if data and not self._ends_with_newline:
+                    # the line processed without its newline was incomplete
+                    status = REPLACED
+
+            if status == REPLACED:
+                file.seek(0)
+                data = self._complete(file.read(), settled)
+
+        if status == APPENDED:
+            hasher = self._hasher
+            hasher.update(data)
+            self._tail = (self._tail + data[-TAIL_CHECK:])[-TAIL_CHECK:]
+        else:
+            hasher = hashlib.sha256(data)
+            if (self._hasher is not None and len(data) == self.offset
+                    and hasher.digest() == self._hasher.digest()):
+                status = UNCHANGED
+            self.offset = 0
+            self._tail = data[-TAIL_CHECK:]
+            self._ends_with_newline = True
+
+        self.inode = inode
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+        self.offset += len(data)
+        self._hasher = hasher
+        if data:
+            self._ends_with_newline = data.endswith(b'\n')
+
+        if status == UNCHANGED or (status == APPENDED and not data):
+            return UNCHANGED, b''
+        return status, data
+
+    def _complete(self, data, settled):
+        # Up to the last newline, or everything once the file has settled
+        if settled:
+            return data
+        return data[:data.rfind(b'\n') + 1]
+
+
+class ChangeWaiter:
+    """
+    Sleeps until the watched file may have changed
+
+    Uses inotify (the optional `inotify_simple` package, Linux) when it is
+    installed, otherwise plain polling. Either way wait() returns after at
+    most `interval` seconds, and FileWatcher.check() decides whether
+    anything really changed.
+    """
+
+    def __init__(self, filename, interval=5.0):
+        self.interval = interval
+        self.name = os.path.basename(filename)
+        self._inotify = None
+
+        try:
+            from inotify_simple import INotify, flags
+        except ImportError:
+            self.mode = "poll"
+            return
+
+        # Watch the directory so editors that save via rename are seen too
+        self._inotify = INotify()
+        self._inotify.add_watch(
+            os.path.dirname(os.path.abspath(filename)),
+            flags.MODIFY | flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.ATTRIB)
+        self.mode = "inotify"
+
+    def wait(self):
+        if self._inotify is None:
+            time.sleep(self.interval)
+            return
+
+        deadline = time.monotonic() + self.interval
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            events = self._inotify.read(timeout=int(remaining * 1000))
+            if any(event.name == self.name for event in events):
+                return
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()